@@ -0,0 +1,2 @@
+# AI Agents Analysis
+# ROI models, healthcare simulation and supporting tools
@@ -3,58 +3,32 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import os
+import sys
+
+if not __package__:
+    # Run as a script: make the ``analysis`` package importable
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis.cache import cached
+from analysis.industry_registry import IndustryRegistry
+from analysis.plotting import lazy_getattr
+from analysis.workforce import WorkforceModel
+
+# plt, sns, px, go and make_subplots are imported on first attribute access
+__getattr__ = lazy_getattr(globals(), ('plt', 'sns', 'px', 'go', 'make_subplots'))
 
 class AIAgentsROIAnalyzer:
-    def __init__(self):
+    def __init__(self, registry=None):
         """Initialize the AI Agents ROI Analyzer with industry-specific data."""
         
-        # Industry-specific ROI data based on research
-        self.industry_data = {
-            'Healthcare': {
-                'market_size_2024': 917.3,  # Million USD (Japan)
-                'market_size_2030': 10890.9,  # Million USD (Japan)
-                'cagr': 42.4,
-                'cost_savings_potential': 150000,  # Million USD globally by 2026
-                'productivity_increase': 40,  # %
-                'error_reduction': 25,  # %
-                'automation_rate': 95,  # % of routine tasks
-                'implementation_cost': 2.5,  # Million USD per 1000 employees
-                'payback_period': 18,  # months
-            },
-            'Finance': {
-                'roi_multiple': 4.2,  # Highest across industries
-                'fraud_detection_improvement': 40,  # %
-                'productivity_increase': 38,  # %
-                'cost_reduction': 25,  # %
-                'automation_rate': 70,  # % of transactions
-                'implementation_cost': 3.0,  # Million USD per 1000 employees
-                'payback_period': 12,  # months
-            },
-            'Logistics': {
-                'fuel_cost_savings': 10,  # %
-                'delivery_efficiency': 25,  # %
-                'route_optimization': 30,  # %
-                'inventory_cost_reduction': 15,  # %
-                'productivity_increase': 25,  # %
-                'implementation_cost': 1.8,  # Million USD per 1000 employees
-                'payback_period': 15,  # months
-            },
-            'Manufacturing': {
-                'productivity_increase': 25,  # %
-                'downtime_reduction': 40,  # %
-                'quality_improvement': 20,  # %
-                'maintenance_cost_savings': 30,  # %
-                'roi_multiple': 3.4,
-                'implementation_cost': 2.2,  # Million USD per 1000 employees
-                'payback_period': 14,  # months
-            }
-        }
+        # Industry-specific ROI data and benefit formulas, see the roi_model section of data/market_data.json
+        self.registry = registry or IndustryRegistry.load()
+        
+        # Yearly growth of benefits and maintenance cost as a share of implementation cost
+        self.annual_benefit_growth = 1.1
+        self.annual_maintenance_rate = 0.1
         
         # General AI agents market data
         self.global_market = {
@@ -73,56 +47,92 @@ class AIAgentsROIAnalyzer:
             'Consultants': {'time_saved_per_day': 1.5, 'efficiency_increase': 25.1},
             'General Workers': {'time_saved_per_day': 1.0, 'efficiency_increase': 30.0}
         }
+        
+        # Fully loaded hourly wage per role, USD
+        self.role_hourly_wages = {
+            'Customer Service': 25,
+            'Business Professionals': 45,
+            'Programmers': 60,
+            'Consultants': 70,
+            'General Workers': 28
+        }
+
+    @property
+    def industry_data(self):
+        """Coefficients per industry, as held by ``registry``."""
+        return self.registry.industry_data
+
+    def _annual_benefits(self, industry, annual_revenue, data=None):
+        """Annual benefits for one industry; ``annual_revenue`` may be a scalar or an array.
+        
+        ``data`` overrides the industry's coefficients; otherwise the compiled
+        registry coefficient is used.
+        """
+        
+        if data is not None:
+            return annual_revenue * self.registry.benefit_coefficient(industry, data)
+        compiled = self.registry.compile()
+        return annual_revenue * compiled.benefit_coefficients[compiled.names.index(industry)]
+
+    def _cumulative_benefit_factors(self, years):
+        """Cumulative benefit multiples for years 1..``years`` (closed-form geometric series)."""
+        
+        growth = self.annual_benefit_growth
+        if growth == 1:
+            return [float(year) for year in range(1, years + 1)]
+        return [(growth ** year - 1) / (growth - 1) for year in range(1, years + 1)]
+
+    def model_coefficients(self):
+        """Every coefficient that shapes ROI results, for cache keys."""
+        
+        return {
+            'industry_data': self.industry_data,
+            'benefit_revenue_shares': self.registry.benefit_revenue_shares,
+            'annual_benefit_growth': self.annual_benefit_growth,
+            'annual_maintenance_rate': self.annual_maintenance_rate,
+        }
 
-    def calculate_roi_by_industry(self, industry, company_size, annual_revenue, years=5):
-        """Calculate ROI for a specific industry and company size."""
+    def calculate_roi_by_industry(self, industry, company_size, annual_revenue, years=5, cache=None):
+        """Calculate ROI for a specific industry and company size.
+        
+        With a ``ResultCache`` as ``cache``, repeated calls with the same arguments
+        and coefficients return a copy of the stored result.
+        """
+        
+        if cache is not None:
+            params = {'industry': industry, 'company_size': company_size,
+                      'annual_revenue': annual_revenue, 'years': years}
+            return cached(cache, 'roi_by_industry', params, self.model_coefficients(),
+                          lambda: self.calculate_roi_by_industry(industry, company_size, annual_revenue, years),
+                          copy_result=True)
         
         if industry not in self.industry_data:
             raise ValueError(f"Industry {industry} not supported")
+        if years < 1:
+            raise ValueError("years must be at least 1")
         
-        data = self.industry_data[industry]
+        # Coefficients come from the compiled registry, as in ``calculate_roi_batch``
+        compiled = self.registry.compile()
+        row = compiled.names.index(industry)
         
         # Calculate implementation costs
-        implementation_cost = (company_size / 1000) * data['implementation_cost']
+        implementation_cost = (company_size / 1000) * compiled.implementation_cost[row].item()
         
         # Calculate annual benefits
-        if industry == 'Healthcare':
-            annual_savings = annual_revenue * (data['productivity_increase'] / 100) * 0.3
-            error_reduction_savings = annual_revenue * 0.05 * (data['error_reduction'] / 100)
-            total_annual_benefits = annual_savings + error_reduction_savings
-            
-        elif industry == 'Finance':
-            cost_reduction = annual_revenue * 0.2 * (data['cost_reduction'] / 100)
-            productivity_gains = annual_revenue * 0.15 * (data['productivity_increase'] / 100)
-            fraud_prevention = annual_revenue * 0.02 * (data['fraud_detection_improvement'] / 100)
-            total_annual_benefits = cost_reduction + productivity_gains + fraud_prevention
-            
-        elif industry == 'Logistics':
-            fuel_savings = annual_revenue * 0.1 * (data['fuel_cost_savings'] / 100)
-            efficiency_gains = annual_revenue * 0.15 * (data['delivery_efficiency'] / 100)
-            inventory_savings = annual_revenue * 0.08 * (data['inventory_cost_reduction'] / 100)
-            total_annual_benefits = fuel_savings + efficiency_gains + inventory_savings
-            
-        elif industry == 'Manufacturing':
-            productivity_gains = annual_revenue * 0.2 * (data['productivity_increase'] / 100)
-            downtime_savings = annual_revenue * 0.05 * (data['downtime_reduction'] / 100)
-            quality_improvements = annual_revenue * 0.03 * (data['quality_improvement'] / 100)
-            maintenance_savings = annual_revenue * 0.04 * (data['maintenance_cost_savings'] / 100)
-            total_annual_benefits = productivity_gains + downtime_savings + quality_improvements + maintenance_savings
+        total_annual_benefits = self._annual_benefits(industry, annual_revenue)
         
         # Calculate cumulative ROI over years
         cumulative_benefits = []
         cumulative_costs = [implementation_cost]
         net_benefits = [-implementation_cost]
         
-        for year in range(1, years + 1):
-            annual_benefit = total_annual_benefits * (1.1 ** (year - 1))
-            cumulative_benefits.append(sum([total_annual_benefits * (1.1 ** i) for i in range(year)]))
-            cumulative_costs.append(implementation_cost + (implementation_cost * 0.1 * year))
+        for year, factor in enumerate(self._cumulative_benefit_factors(years), 1):
+            cumulative_benefits.append(total_annual_benefits * factor)
+            cumulative_costs.append(implementation_cost + (implementation_cost * self.annual_maintenance_rate * year))
             net_benefits.append(cumulative_benefits[-1] - cumulative_costs[-1])
         
         roi_percentage = ((cumulative_benefits[-1] - cumulative_costs[-1]) / implementation_cost) * 100
-        payback_period = data['payback_period']
+        payback_period = compiled.payback_period[row].item()
         
         return {
             'implementation_cost': implementation_cost,
@@ -135,8 +145,99 @@ class AIAgentsROIAnalyzer:
             'break_even_year': next((i for i, x in enumerate(net_benefits[1:], 1) if x > 0), None)
         }
 
-    def create_comprehensive_analysis(self, industry, company_size, annual_revenue, role_mix=None):
-        """Create a comprehensive ROI analysis."""
+    def calculate_roi_batch(self, industries, company_sizes, annual_revenues, years=5, as_frame=False):
+        """Vectorized ``calculate_roi_by_industry`` over arrays of company profiles.
+        
+        Arguments broadcast against each other. Cumulative series are
+        ``(n, max(years))`` arrays padded with NaN beyond each scenario's horizon,
+        and ``break_even_year`` is NaN where it is never reached. Every value
+        matches the scalar function exactly; empty input gives empty results. With
+        ``as_frame`` a DataFrame of the per-scenario scalars is returned instead.
+        """
+        
+        industries, company_sizes, annual_revenues, years = np.broadcast_arrays(
+            np.asarray(industries), np.asarray(company_sizes, dtype=float),
+            np.asarray(annual_revenues, dtype=float), np.asarray(years, dtype=int)
+        )
+        industries, company_sizes, annual_revenues, years = (
+            np.atleast_1d(a).ravel() for a in (industries, company_sizes, annual_revenues, years)
+        )
+        n = len(industries)
+        if n and years.min() < 1:
+            raise ValueError("years must be at least 1")
+        
+        compiled = self.registry.compile()
+        codes = compiled.codes(industries)
+        
+        cost_per_thousand = compiled.implementation_cost[codes]
+        payback_period = compiled.payback_period[codes]
+        total_annual_benefits = annual_revenues * compiled.benefit_coefficients[codes]
+        
+        implementation_cost = (company_sizes / 1000) * cost_per_thousand
+        
+        max_years = int(years.max()) if n else 0
+        year = np.arange(1, max_years + 1)
+        factors = np.array(self._cumulative_benefit_factors(max_years))
+        
+        cumulative_benefits = total_annual_benefits[:, None] * factors
+        cumulative_costs = implementation_cost[:, None] + (
+            implementation_cost[:, None] * self.annual_maintenance_rate * year)
+        net_benefits = cumulative_benefits - cumulative_costs
+        
+        beyond_horizon = year > years[:, None]
+        for series in (cumulative_benefits, cumulative_costs, net_benefits):
+            series[beyond_horizon] = np.nan
+        
+        final = years - 1
+        rows = np.arange(n)
+        roi_percentage = ((cumulative_benefits[rows, final] - cumulative_costs[rows, final]) /
+                          implementation_cost) * 100
+        
+        positive = net_benefits > 0
+        if max_years:
+            break_even_year = np.where(positive.any(axis=1), positive.argmax(axis=1) + 1, np.nan)
+        else:
+            break_even_year = np.full(n, np.nan)
+        
+        results = {
+            'implementation_cost': implementation_cost,
+            'annual_benefits': total_annual_benefits,
+            'cumulative_benefits': cumulative_benefits,
+            'cumulative_costs': cumulative_costs,
+            'net_benefits': net_benefits,
+            'roi_percentage': roi_percentage,
+            'payback_period_months': payback_period,
+            'break_even_year': break_even_year
+        }
+        
+        if as_frame:
+            return pd.DataFrame({
+                'industry': industries,
+                'company_size': company_sizes,
+                'annual_revenue': annual_revenues,
+                'years': years,
+                'implementation_cost': implementation_cost,
+                'annual_benefits': total_annual_benefits,
+                'cumulative_benefits': cumulative_benefits[rows, final],
+                'cumulative_costs': cumulative_costs[rows, final],
+                'roi_percentage': roi_percentage,
+                'payback_period_months': payback_period,
+                'break_even_year': break_even_year
+            })
+        return results
+
+    def workforce_model(self, **kwargs):
+        """``WorkforceModel`` over this analyzer's role productivity and wage tables."""
+        return WorkforceModel(self.role_productivity, self.role_hourly_wages, **kwargs)
+
+    def create_comprehensive_analysis(self, industry, company_size, annual_revenue, role_mix=None,
+                                      hourly_wages=None):
+        """Create a comprehensive ROI analysis.
+        
+        Alongside the industry ROI, ``role_mix`` (shares of ``company_size`` per
+        role) drives a workforce projection of hours saved and value created,
+        whose ROI is taken against the same implementation and maintenance costs.
+        """
         
         if role_mix is None:
             role_mix = {
@@ -148,14 +249,35 @@ class AIAgentsROIAnalyzer:
             }
         
         roi_analysis = self.calculate_roi_by_industry(industry, company_size, annual_revenue)
+        years = len(roi_analysis['cumulative_costs'])
+        
+        model = self.workforce_model()
+        projection = model.project(company_size, role_mix, years=years, hourly_wages=hourly_wages)
+        annual_value = projection['value_created'].sum(axis=(0, 1))
+        cumulative_value = np.cumsum(annual_value)
+        # implementation_cost is per 1000 employees in millions of USD
+        cumulative_costs_usd = np.array(roi_analysis['cumulative_costs']) * 1_000_000
+        implementation_cost_usd = roi_analysis['implementation_cost'] * 1_000_000
+        
+        workforce_analysis = {
+            'by_role': model.summary_by_role(projection),
+            'annual_hours_saved': projection['hours_saved'].sum(axis=(0, 1)).tolist(),
+            'annual_value_created': annual_value.tolist(),
+            'cumulative_value_created': cumulative_value.tolist(),
+            'roi_percentage': (cumulative_value[-1] - cumulative_costs_usd[-1]) / implementation_cost_usd * 100
+        }
         
         return {
             'roi_analysis': roi_analysis,
+            'workforce_analysis': workforce_analysis,
             'summary': {
                 'total_roi_5_years': roi_analysis['roi_percentage'],
                 'payback_period_months': roi_analysis['payback_period_months'],
                 'annual_cost_savings': roi_analysis['annual_benefits'],
-                'implementation_cost': roi_analysis['implementation_cost']
+                'implementation_cost': roi_analysis['implementation_cost'],
+                'workforce_hours_saved': float(projection['hours_saved'].sum()),
+                'workforce_value_created': float(cumulative_value[-1]),
+                'workforce_roi': workforce_analysis['roi_percentage']
             }
         }
 
@@ -177,6 +299,9 @@ def main():
     print(f"• Annual Cost Savings: ${results['summary']['annual_cost_savings']:,.0f}")
     print(f"• 5-Year ROI: {results['summary']['total_roi_5_years']:.1f}%")
     print(f"• Payback Period: {results['summary']['payback_period_months']} months")
+    print(f"• Workforce Hours Saved (5 years): {results['summary']['workforce_hours_saved']:,.0f}")
+    print(f"• Workforce Value Created (5 years): ${results['summary']['workforce_value_created']:,.0f}")
+    print(f"• Workforce ROI: {results['summary']['workforce_roi']:.1f}%")
     
     return results
 
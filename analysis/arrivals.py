@@ -0,0 +1,140 @@
+# Arrival Processes
+# Sorted, vectorized daily arrival streams with day-of-week, seasonal and surge rates
+
+from abc import ABC, abstractmethod
+from datetime import date as Date, datetime
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+def sorted_uniforms(n: int, rng: np.random.Generator) -> np.ndarray:
+    """``n`` sorted uniforms on [0, 1) without sorting.
+    
+    Normalized partial sums of ``n + 1`` exponential spacings are distributed
+    as the order statistics of ``n`` uniforms, so this is O(n).
+    """
+    
+    spacings = rng.standard_exponential(n + 1)
+    cumulative = np.cumsum(spacings)
+    return cumulative[:-1] / cumulative[-1]
+
+
+class ArrivalProcess(ABC):
+    """Daily arrival times as sorted minutes after ``opening_hour``.
+    
+    Subclasses implement ``sample(date, volume, rng)``, where ``volume`` is the
+    day's nominal number of patients, and ``coefficients()`` for cache keys.
+    """
+
+    opening_hour = 8
+
+    @abstractmethod
+    def sample(self, date: datetime, volume: int, rng: np.random.Generator) -> np.ndarray:
+        """Sorted arrival minutes for ``date``."""
+
+    def coefficients(self) -> Dict:
+        return {'process': type(self).__name__, 'opening_hour': self.opening_hour}
+
+
+class PiecewiseConstantArrivals(ArrivalProcess):
+    """Exactly ``volume`` arrivals a day with a piecewise-constant intensity.
+    
+    ``segment_weights`` is the share of the day's arrivals in each
+    ``segment_minutes``-long segment from ``opening_hour``. Arrival times are
+    sorted uniforms pushed through the inverse of the cumulative intensity,
+    which is linear within each segment, then floored to ``resolution``
+    minutes, so they come back sorted.
+    """
+
+    def __init__(self, segment_weights: Sequence[float], segment_minutes: float = 60,
+                 opening_hour: int = 8, resolution: Optional[float] = 1.0):
+        weights = np.asarray(segment_weights, dtype=float)
+        if weights.ndim != 1 or len(weights) == 0 or np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError("segment_weights must be non-negative with a positive sum")
+        self.segment_weights = weights
+        self.segment_minutes = segment_minutes
+        self.opening_hour = opening_hour
+        self.resolution = resolution
+        self._edges = np.arange(len(weights) + 1) * float(segment_minutes)
+        self._cumulative = np.concatenate([[0.0], np.cumsum(weights / weights.sum())])
+
+    @property
+    def open_minutes(self) -> float:
+        return self._edges[-1]
+
+    def _times(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """``n`` sorted arrival minutes from the normalized intensity."""
+        
+        minutes = np.interp(sorted_uniforms(n, rng), self._cumulative, self._edges)
+        if self.resolution:
+            minutes = np.floor(minutes / self.resolution) * self.resolution
+        return minutes
+
+    def sample(self, date: datetime, volume: int, rng: np.random.Generator) -> np.ndarray:
+        return self._times(int(volume), rng)
+
+    def coefficients(self) -> Dict:
+        return {
+            **super().coefficients(),
+            'segment_weights': self.segment_weights,
+            'segment_minutes': self.segment_minutes,
+            'resolution': self.resolution,
+        }
+
+
+class PoissonArrivals(PiecewiseConstantArrivals):
+    """Non-homogeneous Poisson arrivals with day-of-week, seasonal and surge rates.
+    
+    The expected number of arrivals on a day is ``volume`` times
+    ``rate_factor(date)``: the weekday factor (Monday first), the monthly
+    factor (January first), any factor in ``surge_days`` for that date and,
+    with probability ``surge_probability``, a random ``surge_factor``. The
+    day's count is Poisson with that mean and, given the count, arrival times
+    follow ``segment_weights`` as in ``PiecewiseConstantArrivals``, which is
+    exactly a Poisson process with a piecewise-constant rate.
+    """
+
+    def __init__(self, segment_weights: Sequence[float], segment_minutes: float = 60,
+                 opening_hour: int = 8, resolution: Optional[float] = 1.0,
+                 day_of_week_factors: Sequence[float] = (1.0,) * 7,
+                 monthly_factors: Sequence[float] = (1.0,) * 12,
+                 surge_days: Optional[Dict[Date, float]] = None,
+                 surge_probability: float = 0.0, surge_factor: float = 1.5):
+        super().__init__(segment_weights, segment_minutes, opening_hour, resolution)
+        if len(day_of_week_factors) != 7 or len(monthly_factors) != 12:
+            raise ValueError("Expected 7 day-of-week factors and 12 monthly factors")
+        self.day_of_week_factors = np.asarray(day_of_week_factors, dtype=float)
+        self.monthly_factors = np.asarray(monthly_factors, dtype=float)
+        self.surge_days = {(d.date() if isinstance(d, datetime) else d): factor
+                           for d, factor in (surge_days or {}).items()}
+        self.surge_probability = surge_probability
+        self.surge_factor = surge_factor
+
+    def rate_factor(self, date: datetime, rng: Optional[np.random.Generator] = None) -> float:
+        """Multiplier on the nominal daily volume; random surges need ``rng``."""
+        
+        day = date.date() if isinstance(date, datetime) else date
+        factor = self.day_of_week_factors[day.weekday()] * self.monthly_factors[day.month - 1]
+        factor *= self.surge_days.get(day, 1.0)
+        if self.surge_probability > 0 and rng is not None and rng.random() < self.surge_probability:
+            factor *= self.surge_factor
+        return float(factor)
+
+    def expected_arrivals(self, date: datetime, volume: float) -> float:
+        """Mean arrivals on ``date`` without random surges."""
+        return volume * self.rate_factor(date)
+
+    def sample(self, date: datetime, volume: float, rng: np.random.Generator) -> np.ndarray:
+        n = rng.poisson(volume * self.rate_factor(date, rng))
+        return self._times(n, rng)
+
+    def coefficients(self) -> Dict:
+        return {
+            **super().coefficients(),
+            'day_of_week_factors': self.day_of_week_factors,
+            'monthly_factors': self.monthly_factors,
+            'surge_days': {d.isoformat(): factor for d, factor in self.surge_days.items()},
+            'surge_probability': self.surge_probability,
+            'surge_factor': self.surge_factor,
+        }
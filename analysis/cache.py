@@ -0,0 +1,233 @@
+# Result Cache
+# Content-addressed memory and disk cache for simulation runs and ROI results
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from analysis.patient_batch import PatientBatch
+
+# Bump when the stored layout or the meaning of cached results changes
+CACHE_VERSION = 2
+
+_BATCH_COLUMNS = ('age', 'condition', 'severity', 'arrival_minute', 'patient_index',
+                  'wait_time', 'treatment_duration', 'cost', 'ai_assisted')
+
+
+def _canonical(value):
+    """JSON-safe canonical form of parameters and coefficient tables."""
+    if isinstance(value, dict):
+        return sorted([str(key), _canonical(item)] for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _canonical(value.tolist())
+    if isinstance(value, np.generic):
+        return _canonical(value.item())
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, np.random.SeedSequence):
+        return ['SeedSequence', _canonical(value.entropy), list(value.spawn_key)]
+    return value
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, PatientBatch):
+        return value.nbytes
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    return len(json.dumps(_canonical(value)))
+
+
+def _freeze(value):
+    """Make cached arrays read-only so callers cannot change a shared result."""
+    if isinstance(value, PatientBatch):
+        for name in _BATCH_COLUMNS:
+            getattr(value, name).flags.writeable = False
+    elif isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    return value
+
+
+class ResultCache:
+    """Two-tier cache keyed by a hash of parameters, seed and model coefficients.
+    
+    The memory tier is an LRU bounded by ``max_memory_bytes``. The optional disk
+    tier under ``directory`` stores arrays and ``PatientBatch`` columns as ``.npy``
+    files that are memory-mapped on load, and JSON for everything else; it is
+    bounded by ``max_disk_bytes`` and evicts the least recently used entries.
+    Since coefficients are part of the key, changing them misses automatically.
+    Cached arrays are read-only.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_memory_bytes: int = 512 * 2 ** 20,
+                 max_disk_bytes: int = 4 * 2 ** 30):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self.hits = {'memory': 0, 'disk': 0}
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(kind: str, params: Dict, coefficients: Dict) -> str:
+        payload = json.dumps([CACHE_VERSION, kind, _canonical(params), _canonical(coefficients)],
+                             sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @property
+    def stats(self) -> Dict:
+        lookups = self.hits['memory'] + self.hits['disk'] + self.misses
+        return {
+            'memory_hits': self.hits['memory'],
+            'disk_hits': self.hits['disk'],
+            'misses': self.misses,
+            'hit_rate': (lookups - self.misses) / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'memory_bytes': self._memory_bytes,
+            'disk_bytes': self._disk_usage()[0] if self.directory else 0,
+        }
+
+    def get(self, key: str) -> Optional[Any]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits['memory'] += 1
+            return self._memory[key][0]
+        
+        if self.directory is not None:
+            entry = os.path.join(self.directory, key)
+            if os.path.isdir(entry):
+                value = _freeze(self._load(entry))
+                os.utime(entry)
+                self.hits['disk'] += 1
+                self._remember(key, value)
+                return value
+        
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any):
+        value = _freeze(value)
+        self._remember(key, value)
+        if self.directory is not None:
+            self._store(key, value)
+            self._evict_disk()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _remember(self, key: str, value: Any):
+        size = _nbytes(value)
+        if size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        self._memory[key] = (value, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def _store(self, key: str, value: Any):
+        entry = os.path.join(self.directory, key)
+        if os.path.isdir(entry):
+            return
+        staging = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        
+        fields = {}
+        items = value.items() if isinstance(value, dict) else [('value', value)]
+        for name, item in items:
+            if isinstance(item, PatientBatch):
+                for column in _BATCH_COLUMNS:
+                    np.save(os.path.join(staging, f"{name}.{column}.npy"), getattr(item, column))
+                fields[name] = {'type': 'batch', 'condition_names': item.condition_names,
+                                'severity_names': item.severity_names}
+            elif isinstance(item, np.ndarray):
+                np.save(os.path.join(staging, f"{name}.npy"), item)
+                fields[name] = {'type': 'array'}
+            else:
+                fields[name] = {'type': 'json', 'value': item}
+        
+        with open(os.path.join(staging, 'meta.json'), 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'is_dict': isinstance(value, dict), 'fields': fields},
+                      f, default=lambda o: o.item() if isinstance(o, np.generic) else str(o))
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _load(self, entry: str) -> Any:
+        with open(os.path.join(entry, 'meta.json')) as f:
+            meta = json.load(f)
+        
+        value = {}
+        for name, field in meta['fields'].items():
+            if field['type'] == 'batch':
+                columns = {column: np.load(os.path.join(entry, f"{name}.{column}.npy"), mmap_mode='r')
+                           for column in _BATCH_COLUMNS}
+                value[name] = PatientBatch(condition_names=field['condition_names'],
+                                           severity_names=field['severity_names'], **columns)
+            elif field['type'] == 'array':
+                value[name] = np.load(os.path.join(entry, f"{name}.npy"), mmap_mode='r')
+            else:
+                value[name] = field['value']
+        return value if meta['is_dict'] else value['value']
+
+    def _disk_usage(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith('.tmp-') or not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            entries.append((os.path.getmtime(path), path, size))
+            total += size
+        return total, entries
+
+    def _evict_disk(self):
+        total, entries = self._disk_usage()
+        for _, path, size in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+def cached(cache: Optional[ResultCache], kind: str, params: Dict, coefficients: Dict,
+           compute: Callable[[], Any], copy_result: bool = False) -> Any:
+    """Return ``compute()`` through ``cache`` when one is given.
+    
+    With ``copy_result`` a deep copy is returned so small mutable results, such
+    as ROI dicts, can be modified by callers without touching the cache.
+    """
+    if cache is None:
+        return compute()
+    value = cache.get_or_compute(ResultCache.key(kind, params, coefficients), compute)
+    return copy.deepcopy(value) if copy_result else value
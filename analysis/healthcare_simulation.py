@@ -3,14 +3,39 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import random
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Sequence, Tuple, Union
+import os
+import sys
 import warnings
+
+if not __package__:
+    # Run as a script: make the ``analysis`` package importable
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis.arrivals import ArrivalProcess, PiecewiseConstantArrivals
+from analysis.cache import ResultCache, cached
+from analysis.grouped_metrics import DIMENSIONS, grouped_metrics
+from analysis.instrumentation import NULL_HOOKS, Instrumentation, ProgressPrinter, SimulationHooks
+from analysis.patient_batch import PatientBatch
+from analysis.plotting import lazy_getattr
+from analysis.queueing import (QUEUE_MODELS, SEVERITY_PRIORITY, legacy_wait_times, multi_server_wait_times,
+                               queue_length_high_water)
+from analysis.replication import run_replications
+from analysis.reporting import build_report
+from analysis.sinks import RunningMetrics, read_stream
+
 warnings.filterwarnings('ignore')
 
+# plt is imported on first attribute access
+__getattr__ = lazy_getattr(globals(), ('plt',))
+
+SEVERITY_LEVELS = ['Low', 'Medium', 'High', 'Critical']
+
 @dataclass
 class Patient:
     """Patient data structure for simulation."""
@@ -24,6 +49,11 @@ class Patient:
     cost: float = 0
     ai_assisted: bool = False
 
+def _sample_codes(cdf: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Draw one category code per row of a cumulative probability table."""
+    codes = (rng.random(len(cdf))[:, None] >= cdf).sum(axis=1)
+    return np.minimum(codes, cdf.shape[1] - 1)
+
 class HealthcareSimulator:
     def __init__(self):
         """Initialize healthcare simulation parameters."""
@@ -44,6 +74,25 @@ class HealthcareSimulator:
             (81, 100): 0.08
         }
         
+        # Condition mix per age group: under 40, 40-64, 65 and over
+        self.age_group_bounds = [40, 65]
+        self.condition_probs_by_age = [
+            [0.5, 0.2, 0.1, 0.1, 0.1],
+            [0.3, 0.3, 0.2, 0.15, 0.05],
+            [0.2, 0.25, 0.25, 0.25, 0.05]
+        ]
+        
+        self.severity_probs = {
+            'Emergency': {'High': 0.6, 'Critical': 0.4},
+            'default': {'Low': 0.5, 'Medium': 0.3, 'High': 0.2}
+        }
+        self.severity_multipliers = {'Low': 0.8, 'Medium': 1.0, 'High': 1.3, 'Critical': 1.8}
+        
+        # Share of daily arrivals per hour from 08:00; swap in a ``PoissonArrivals``
+        # for random daily volumes with weekday, seasonal and surge rates
+        self.arrival_process: ArrivalProcess = PiecewiseConstantArrivals(
+            [0.15, 0.18, 0.16, 0.14, 0.12, 0.10, 0.08, 0.05, 0.02], opening_hour=8)
+        
         self.ai_improvements = {
             1: {'time_reduction': 0.25, 'cost_reduction': 0.15, 'error_reduction': 0.30},
             2: {'time_reduction': 0.35, 'cost_reduction': 0.20, 'error_reduction': 0.40},
@@ -52,38 +101,42 @@ class HealthcareSimulator:
             5: {'time_reduction': 0.30, 'cost_reduction': 0.20, 'error_reduction': 0.45}
         }
 
+    def model_coefficients(self) -> Dict:
+        """Every coefficient that shapes simulated patients, for cache keys."""
+        
+        return {
+            'conditions': self.conditions,
+            'age_weights': self.age_weights,
+            'ai_improvements': self.ai_improvements,
+            'age_group_bounds': self.age_group_bounds,
+            'condition_probs_by_age': self.condition_probs_by_age,
+            'severity_probs': self.severity_probs,
+            'severity_multipliers': self.severity_multipliers,
+            'arrival_process': self.arrival_process.coefficients(),
+        }
+
     def generate_patient(self, patient_id: str, timestamp: datetime, ai_enabled: bool = False) -> Patient:
         """Generate a synthetic patient with realistic characteristics."""
         
-        age_range = np.random.choice(
-            list(self.age_weights.keys()),
-            p=list(self.age_weights.values())
-        )
+        age_ranges = list(self.age_weights.keys())
+        age_range = age_ranges[np.random.choice(len(age_ranges), p=list(self.age_weights.values()))]
         age = np.random.randint(age_range[0], age_range[1] + 1)
         
-        if age < 40:
-            condition_probs = [0.5, 0.2, 0.1, 0.1, 0.1]
-        elif age < 65:
-            condition_probs = [0.3, 0.3, 0.2, 0.15, 0.05]
-        else:
-            condition_probs = [0.2, 0.25, 0.25, 0.25, 0.05]
-        
+        age_group = int(np.searchsorted(self.age_group_bounds, age, side='right'))
         condition = np.random.choice(
             list(self.conditions.keys()),
-            p=condition_probs
+            p=self.condition_probs_by_age[age_group]
         )
         
-        if condition == 'Emergency':
-            severity = np.random.choice(['High', 'Critical'], p=[0.6, 0.4])
-        else:
-            severity = np.random.choice(['Low', 'Medium', 'High'], p=[0.5, 0.3, 0.2])
+        severity_probs = self.severity_probs.get(condition, self.severity_probs['default'])
+        severity = np.random.choice(list(severity_probs.keys()), p=list(severity_probs.values()))
         
         base_duration = self.conditions[condition]['base_duration']
         base_cost = self.conditions[condition]['cost_base']
         complexity = self.conditions[condition]['complexity']
         
         age_multiplier = 1 + (age - 40) * 0.01 if age > 40 else 1
-        severity_multiplier = {'Low': 0.8, 'Medium': 1.0, 'High': 1.3, 'Critical': 1.8}[severity]
+        severity_multiplier = self.severity_multipliers[severity]
         
         treatment_duration = base_duration * age_multiplier * severity_multiplier
         cost = base_cost * age_multiplier * severity_multiplier
@@ -107,129 +160,421 @@ class HealthcareSimulator:
             ai_assisted=ai_enabled
         )
 
-    def simulate_hospital_day(self, date: datetime, ai_enabled: bool = False, num_patients: int = 200) -> List[Patient]:
-        """Simulate a full day of hospital operations."""
+    def generate_patients(self, n: int, date: datetime, ai_enabled: bool = False,
+                          rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """Generate ``n`` synthetic patients at once as NumPy arrays.
         
-        patients = []
-        start_time = date.replace(hour=8, minute=0, second=0)
+        Vectorized counterpart of ``generate_patient``: age bands, ages, conditions,
+        severities, multipliers and noise are drawn for the whole batch from the same
+        distributions. Conditions and severities are returned as integer codes into
+        ``list(self.conditions)`` and ``SEVERITY_LEVELS``.
+        """
         
-        for i in range(num_patients):
-            hour_weights = [0.15, 0.18, 0.16, 0.14, 0.12, 0.10, 0.08, 0.05, 0.02]
-            hour_offset = np.random.choice(range(10), p=hour_weights)
-            minute_offset = np.random.randint(0, 60)
-            
-            arrival_time = start_time + timedelta(hours=hour_offset, minutes=minute_offset)
-            
-            patient = self.generate_patient(f"P{date.strftime('%Y%m%d')}_{i:03d}", arrival_time, ai_enabled)
-            patients.append(patient)
+        if rng is None:
+            rng = np.random.default_rng()
+        return self._apply_scenario(self._draw_patients(n, date, rng), ai_enabled)
+
+    def _draw_patients(self, n: int, date: datetime, rng: np.random.Generator,
+                       condition_weights: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Scenario-independent random draws for ``n`` patients.
         
-        patients.sort(key=lambda p: p.arrival_time)
+        ``condition_weights`` reweights the age-specific condition mix, one
+        weight per condition, to model a facility's own case mix.
+        """
         
-        current_time = start_time
-        active_treatments = []
+        condition_names = list(self.conditions.keys())
         
-        for patient in patients:
-            active_treatments = [t for t in active_treatments if t > patient.arrival_time]
-            
-            if len(active_treatments) > 10:
-                patient.wait_time = (len(active_treatments) - 10) * 15
-            else:
-                patient.wait_time = max(0, np.random.normal(10, 5))
-            
-            if ai_enabled:
-                patient.wait_time *= 0.6
-            
-            treatment_end = patient.arrival_time + timedelta(
-                minutes=patient.wait_time + patient.treatment_duration
-            )
-            active_treatments.append(treatment_end)
+        age_ranges = np.array(list(self.age_weights.keys()))
+        age_band = rng.choice(len(age_ranges), size=n, p=list(self.age_weights.values()))
+        age = rng.integers(age_ranges[age_band, 0], age_ranges[age_band, 1] + 1)
+        
+        age_group = np.searchsorted(self.age_group_bounds, age, side='right')
+        condition_probs = np.asarray(self.condition_probs_by_age, dtype=float)
+        if condition_weights is not None:
+            condition_probs = condition_probs * condition_weights
+            condition_probs /= condition_probs.sum(axis=1, keepdims=True)
+        condition_cdf = np.cumsum(condition_probs, axis=1)
+        condition = _sample_codes(condition_cdf[age_group], rng)
+        
+        severity_table = np.zeros((len(condition_names), len(SEVERITY_LEVELS)))
+        for i, name in enumerate(condition_names):
+            probs = self.severity_probs.get(name, self.severity_probs['default'])
+            for level, p in probs.items():
+                severity_table[i, SEVERITY_LEVELS.index(level)] = p
+        severity = _sample_codes(np.cumsum(severity_table, axis=1)[condition], rng)
+        
+        base_duration = np.array([c['base_duration'] for c in self.conditions.values()], dtype=float)
+        base_cost = np.array([c['cost_base'] for c in self.conditions.values()], dtype=float)
+        
+        age_multiplier = np.where(age > 40, 1 + (age - 40) * 0.01, 1.0)
+        severity_multiplier = np.array([self.severity_multipliers[s] for s in SEVERITY_LEVELS])[severity]
+        
+        return {
+            'age': age,
+            'condition': condition.astype(np.int8),
+            'severity': severity.astype(np.int8),
+            'arrival_time': np.full(n, np.datetime64(date, 's')),
+            'base_duration': base_duration[condition] * age_multiplier * severity_multiplier,
+            'base_cost': base_cost[condition] * age_multiplier * severity_multiplier,
+            'duration_noise': rng.normal(1, 0.1, size=n),
+            'cost_noise': rng.normal(1, 0.05, size=n)
+        }
+
+    def _apply_scenario(self, draws: Dict[str, np.ndarray],
+                        ai_enabled: Union[bool, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Treatment durations and costs of drawn patients under one scenario.
         
+        The AI time and cost reductions are applied as a vectorized transform, so
+        the same draws can be evaluated under both scenarios. ``ai_enabled`` may
+        also be a per-patient mask for partial adoption.
+        """
+        
+        treatment_duration = draws['base_duration']
+        cost = draws['base_cost']
+        
+        if np.any(ai_enabled):
+            complexity = [c['complexity'] for c in self.conditions.values()]
+            time_reduction = np.array([self.ai_improvements[c]['time_reduction'] for c in complexity])
+            cost_reduction = np.array([self.ai_improvements[c]['cost_reduction'] for c in complexity])
+            treatment_duration = treatment_duration * (1 - time_reduction[draws['condition']] * ai_enabled)
+            cost = cost * (1 - cost_reduction[draws['condition']] * ai_enabled)
+        
+        patients = {name: draws[name] for name in ('age', 'condition', 'severity', 'arrival_time', 'patient_index')
+                    if name in draws}
+        patients['treatment_duration'] = np.maximum(15, treatment_duration * draws['duration_noise'])
+        patients['cost'] = np.maximum(5000, cost * draws['cost_noise'])
+        patients['ai_assisted'] = np.zeros(len(cost), dtype=bool) | ai_enabled
+        return patients
+
+    def simulate_hospital_day(self, date: datetime, ai_enabled: bool = False, num_patients: int = 200,
+                              queue_model: str = 'legacy', servers: int = 10) -> List[Patient]:
+        """Simulate a full day of hospital operations.
+        
+        ``queue_model`` selects how wait times are produced: ``'legacy'`` keeps the
+        original capacity heuristic (``servers`` in treatment, 15 minutes per excess
+        patient), ``'fifo'`` and ``'priority'`` run a multi-server queue with
+        ``servers`` treatment slots, the latter serving higher severities first.
+        Arrival times come from ``arrival_process``, with ``num_patients`` as
+        the nominal daily volume.
+        """
+        
+        if queue_model not in QUEUE_MODELS:
+            raise ValueError(f"Unknown queue model {queue_model!r}, expected one of {QUEUE_MODELS}")
+        
+        start_time = date.replace(hour=self.arrival_process.opening_hour, minute=0, second=0)
+        # Arrivals come back sorted, so patients are generated in arrival order
+        arrival_rng = np.random.default_rng(np.random.randint(2**32, dtype=np.int64))
+        arrivals = self.arrival_process.sample(date, num_patients, arrival_rng)
+        
+        patients = [
+            self.generate_patient(f"P{date.strftime('%Y%m%d')}_{i:03d}",
+                                  start_time + timedelta(minutes=float(minutes)), ai_enabled)
+            for i, minutes in enumerate(arrivals.tolist())
+        ]
+        
+        durations = np.array([p.treatment_duration for p in patients])
+        severities = np.array([SEVERITY_LEVELS.index(p.severity) for p in patients], dtype=np.int8)
+        base_wait = np.maximum(0, np.random.normal(10, 5, size=len(patients)))
+        wait_times = self._wait_times(arrivals, durations, severities, base_wait, ai_enabled,
+                                      queue_model, servers)
+        
+        for patient, wait_time in zip(patients, wait_times.tolist()):
+            patient.wait_time = wait_time
+        
+        return patients
+
+    def _wait_times(self, arrivals: np.ndarray, durations: np.ndarray, severities: np.ndarray,
+                    base_wait: np.ndarray, ai_enabled: Union[bool, np.ndarray], queue_model: str,
+                    servers: int) -> np.ndarray:
+        """Wait times for one day of sorted arrivals under the chosen queue model."""
+        
+        if queue_model == 'legacy':
+            return legacy_wait_times(arrivals, durations, base_wait, capacity=servers,
+                                     wait_factor=np.where(ai_enabled, 0.6, 1.0))
+        
+        priorities = None
+        if queue_model == 'priority':
+            priorities = np.array([SEVERITY_PRIORITY[s] for s in SEVERITY_LEVELS])[severities]
+        return multi_server_wait_times(arrivals, durations, servers, priorities)
+
+    def _draw_day(self, date: datetime, num_patients: int, rng: np.random.Generator,
+                  hooks: SimulationHooks = NULL_HOOKS,
+                  condition_weights: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Scenario-independent draws for one day, sorted by arrival."""
+        
+        with hooks.phase('generate'):
+            draws = self._draw_day_columns(date, num_patients, rng, condition_weights)
+        hooks.count('patients_generated', len(draws['arrival_minutes']))
+        return draws
+
+    def _draw_day_columns(self, date: datetime, num_patients: int, rng: np.random.Generator,
+                          condition_weights: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Untimed body of ``_draw_day``.
+        
+        ``num_patients`` is the nominal volume handed to ``arrival_process``,
+        which decides the actual count and returns sorted arrivals, so patients
+        are generated in arrival order and need no sort.
+        """
+        
+        start_time = date.replace(hour=self.arrival_process.opening_hour, minute=0, second=0)
+        arrival_minutes = self.arrival_process.sample(date, num_patients, rng)
+        n = len(arrival_minutes)
+        draws = self._draw_patients(n, start_time, rng, condition_weights)
+        
+        draws['patient_index'] = np.arange(n, dtype=np.int32)
+        draws['arrival_time'] = draws['arrival_time'] + arrival_minutes.astype('timedelta64[m]')
+        draws['arrival_minutes'] = arrival_minutes
+        draws['base_wait'] = np.maximum(0, rng.normal(10, 5, size=n))
+        return draws
+
+    def _complete_day(self, draws: Dict[str, np.ndarray], ai_enabled: Union[bool, np.ndarray], queue_model: str,
+                      servers: int, hooks: SimulationHooks = NULL_HOOKS) -> Dict[str, np.ndarray]:
+        """Apply one scenario to a day of draws and queue its patients."""
+        
+        with hooks.phase('scenario'):
+            patients = self._apply_scenario(draws, ai_enabled)
+        with hooks.phase('queue'):
+            patients['wait_time'] = self._wait_times(
+                draws['arrival_minutes'], patients['treatment_duration'], patients['severity'],
+                draws['base_wait'], ai_enabled, queue_model, servers
+            )
+        if hooks.enabled:
+            hooks.gauge_max('queue_length_high_water',
+                            queue_length_high_water(draws['arrival_minutes'], patients['wait_time']))
         return patients
 
-    def run_comparative_simulation(self, days: int = 30) -> Dict:
-        """Run simulation comparing AI vs non-AI scenarios."""
+    def simulate_day_arrays(self, date: datetime, ai_enabled: bool = False, num_patients: int = 200,
+                            rng: Optional[np.random.Generator] = None, queue_model: str = 'legacy',
+                            servers: int = 10, hooks: SimulationHooks = NULL_HOOKS,
+                            condition_weights: Optional[np.ndarray] = None,
+                            ai_fraction: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Vectorized ``simulate_hospital_day`` returning one array per patient attribute.
+        
+        Patients are generated in arrival order and ``patient_index`` numbers
+        them within the day, which is what patient ids are built from. The
+        day's count is ``num_patients`` unless ``arrival_process`` draws it.
+        ``hooks`` times the generation, scenario and queueing phases and
+        ``condition_weights`` reweights the condition mix, see ``_draw_patients``.
+        
+        ``ai_fraction`` overrides ``ai_enabled`` with partial adoption: each
+        patient is AI-assisted when a uniform draw, taken after the day's other
+        draws, falls below it. With the same ``rng`` state, a larger fraction
+        assists a superset of the same patients.
+        """
+        
+        if queue_model not in QUEUE_MODELS:
+            raise ValueError(f"Unknown queue model {queue_model!r}, expected one of {QUEUE_MODELS}")
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        draws = self._draw_day(date, num_patients, rng, hooks, condition_weights)
+        if ai_fraction is not None:
+            ai_enabled = rng.random(len(draws['arrival_minutes'])) < ai_fraction
+        return self._complete_day(draws, ai_enabled, queue_model, servers, hooks)
+
+    def simulate_paired_day_arrays(self, date: datetime, num_patients: int = 200,
+                                   rng: Optional[np.random.Generator] = None, queue_model: str = 'legacy',
+                                   servers: int = 10, hooks: SimulationHooks = NULL_HOOKS,
+                                   condition_weights: Optional[np.ndarray] = None
+                                   ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Traditional and AI-enabled versions of the same simulated day.
+        
+        Arrivals, conditions, severities and noise are drawn once (common random
+        numbers) and only the AI reductions and wait-time factor differ, so the
+        difference between scenarios carries no sampling noise of its own.
+        """
+        
+        if queue_model not in QUEUE_MODELS:
+            raise ValueError(f"Unknown queue model {queue_model!r}, expected one of {QUEUE_MODELS}")
+        if rng is None:
+            rng = np.random.default_rng()
         
+        draws = self._draw_day(date, num_patients, rng, hooks, condition_weights)
+        return (self._complete_day(draws, False, queue_model, servers, hooks),
+                self._complete_day(draws, True, queue_model, servers, hooks))
+
+    def iter_comparative_simulation(self, days: int = 30, seed: Optional[Union[int, np.random.SeedSequence]] = None,
+                                    workers: Optional[int] = None, block_days: Optional[int] = None,
+                                    num_patients: int = 200, queue_model: str = 'legacy',
+                                    servers: int = 10, paired: bool = False,
+                                    verbose: bool = False,
+                                    hooks: Optional[SimulationHooks] = None) -> Iterator[Dict]:
+        """Yield the comparative simulation one block of days at a time, in day order.
+        
+        Each chunk holds ``days`` (the day numbers it covers) and ``traditional``
+        and ``ai_enabled`` ``PatientBatch`` results. Only a bounded number of blocks
+        is in flight, so memory does not grow with the number of simulated days.
+        Seeding and parameters are as for ``run_comparative_simulation``.
+        
+        ``hooks`` receive start and per-day progress, and the phase timings and
+        counters of every block, including those run in worker processes. Stream
+        consumers call ``hooks.finish()`` themselves once done.
+        """
+        
+        if days < 1:
+            raise ValueError("days must be at least 1")
         start_date = datetime(2025, 1, 1)
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        day_seeds = seed.spawn(days)
+        day_kwargs = {'num_patients': num_patients, 'queue_model': queue_model, 'servers': servers}
+        if queue_model not in QUEUE_MODELS:
+            raise ValueError(f"Unknown queue model {queue_model!r}, expected one of {QUEUE_MODELS}")
         
-        traditional_results = []
-        ai_results = []
+        if workers is None or workers < 1:
+            workers = 1
+        if block_days is None:
+            block_days = min(max(1, -(-days // (workers * 4))), 30)
+        blocks = [list(range(first, min(first + block_days, days)))
+                  for first in range(0, days, block_days)]
         
-        print(f"Running {days}-day hospital simulation...")
+        if hooks is None:
+            hooks = ProgressPrinter() if verbose else NULL_HOOKS
+        hooks.start(days)
         
-        for day in range(days):
-            current_date = start_date + timedelta(days=day)
-            
-            traditional_patients = self.simulate_hospital_day(current_date, ai_enabled=False)
-            traditional_results.extend(traditional_patients)
-            
-            ai_patients = self.simulate_hospital_day(current_date, ai_enabled=True)
-            ai_results.extend(ai_patients)
-            
-            if (day + 1) % 10 == 0:
-                print(f"Completed {day + 1} days...")
+        completed_days = 0
         
-        return {
-            'traditional': traditional_results,
-            'ai_enabled': ai_results,
-            'simulation_period': f"{days} days"
-        }
+        def chunk(block, result):
+            nonlocal completed_days
+            for _ in block:
+                completed_days += 1
+                hooks.progress(completed_days, days)
+            return {'days': block, 'traditional': result[0], 'ai_enabled': result[1]}
+        
+        if workers == 1:
+            for block in blocks:
+                yield chunk(block, _simulate_days(self, start_date, block,
+                                                  [day_seeds[d] for d in block], paired, day_kwargs, hooks))
+            return
+        
+        def submit(executor, block):
+            return executor.submit(_simulate_days_instrumented if hooks.enabled else _simulate_days,
+                                   self, start_date, block, [day_seeds[d] for d in block], paired, day_kwargs)
+        
+        def collect(block, result):
+            if hooks.enabled:
+                result, metrics = result
+                hooks.merge(metrics)
+            return chunk(block, result)
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            remaining = iter(blocks)
+            for block in remaining:
+                pending.append((block, submit(executor, block)))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                block, future = pending.popleft()
+                result = future.result()
+                next_block = next(remaining, None)
+                if next_block is not None:
+                    pending.append((next_block, submit(executor, next_block)))
+                yield collect(block, result)
 
-    def analyze_results(self, simulation_results: Dict) -> Dict:
-        """Analyze simulation results and calculate key metrics."""
+    def run_comparative_simulation(self, days: int = 30, seed: Optional[Union[int, np.random.SeedSequence]] = None,
+                                   workers: Optional[int] = None, block_days: Optional[int] = None,
+                                   num_patients: int = 200, queue_model: str = 'legacy',
+                                   servers: int = 10, paired: bool = False, verbose: bool = True,
+                                   cache: Optional[ResultCache] = None,
+                                   hooks: Optional[SimulationHooks] = None) -> Dict:
+        """Run simulation comparing AI vs non-AI scenarios.
         
-        traditional = simulation_results['traditional']
-        ai_enabled = simulation_results['ai_enabled']
+        Every day draws from its own generator spawned from ``SeedSequence(seed)``,
+        so a given seed reproduces the same results whatever ``workers`` is. With
+        ``workers`` > 1, blocks of ``block_days`` days run in a process pool and
+        come back as compact ``PatientBatch`` arrays rather than ``Patient`` objects.
+        ``paired`` evaluates both scenarios on the same patients, see
+        ``simulate_paired_day_arrays``. Use ``iter_comparative_simulation`` to
+        stream long runs instead of holding every patient in memory.
         
-        trad_df = pd.DataFrame([
-            {
-                'patient_id': p.id,
-                'age': p.age,
-                'condition': p.condition,
-                'severity': p.severity,
-                'wait_time': p.wait_time,
-                'treatment_duration': p.treatment_duration,
-                'total_time': p.wait_time + p.treatment_duration,
-                'cost': p.cost,
-                'scenario': 'Traditional'
-            }
-            for p in traditional
-        ])
-        
-        ai_df = pd.DataFrame([
-            {
-                'patient_id': p.id,
-                'age': p.age,
-                'condition': p.condition,
-                'severity': p.severity,
-                'wait_time': p.wait_time,
-                'treatment_duration': p.treatment_duration,
-                'total_time': p.wait_time + p.treatment_duration,
-                'cost': p.cost,
-                'scenario': 'AI-Enabled'
-            }
-            for p in ai_enabled
-        ])
-        
-        metrics = {
-            'traditional': {
-                'avg_wait_time': trad_df['wait_time'].mean(),
-                'avg_treatment_time': trad_df['treatment_duration'].mean(),
-                'avg_total_time': trad_df['total_time'].mean(),
-                'avg_cost_per_patient': trad_df['cost'].mean(),
-                'total_cost': trad_df['cost'].sum(),
-                'total_patients': len(trad_df),
-            },
-            'ai_enabled': {
-                'avg_wait_time': ai_df['wait_time'].mean(),
-                'avg_treatment_time': ai_df['treatment_duration'].mean(),
-                'avg_total_time': ai_df['total_time'].mean(),
-                'avg_cost_per_patient': ai_df['cost'].mean(),
-                'total_cost': ai_df['cost'].sum(),
-                'total_patients': len(ai_df),
-            }
+        Seeded runs are served from ``cache`` when given, keyed by the parameters
+        and ``model_coefficients()``; unseeded runs are never cached.
+        
+        Progress goes through ``hooks``, which default to printing when
+        ``verbose``. Pass an ``analysis.instrumentation.Instrumentation`` to
+        collect phase timings and counters; its ``finish()`` runs (and writes its
+        export) once the results are assembled. Cache hits do not simulate and
+        leave the hooks untouched.
+        """
+        
+        if hooks is None:
+            hooks = ProgressPrinter() if verbose else NULL_HOOKS
+        
+        def simulate():
+            chunks = list(self.iter_comparative_simulation(
+                days, seed=seed, workers=workers, block_days=block_days, num_patients=num_patients,
+                queue_model=queue_model, servers=servers, paired=paired, hooks=hooks
+            ))
+            with hooks.phase('concat'):
+                results = {
+                    'traditional': PatientBatch.concat([chunk['traditional'] for chunk in chunks]),
+                    'ai_enabled': PatientBatch.concat([chunk['ai_enabled'] for chunk in chunks]),
+                    'simulation_period': f"{days} days"
+                }
+            hooks.finish()
+            return results
+        
+        if seed is None:
+            return simulate()
+        
+        params = {'days': days, 'seed': seed, 'num_patients': num_patients, 'queue_model': queue_model,
+                  'servers': servers, 'paired': paired}
+        return cached(cache, 'comparative_simulation', params, self.model_coefficients(), simulate)
+
+    def _patients_frame(self, patients, scenario: str) -> pd.DataFrame:
+        """Per-patient DataFrame from a list of ``Patient`` objects or a dict of columns."""
+        
+        if isinstance(patients, list):
+            return pd.DataFrame([
+                {
+                    'patient_id': p.id,
+                    'age': p.age,
+                    'condition': p.condition,
+                    'severity': p.severity,
+                    'wait_time': p.wait_time,
+                    'treatment_duration': p.treatment_duration,
+                    'total_time': p.wait_time + p.treatment_duration,
+                    'cost': p.cost,
+                    'scenario': scenario
+                }
+                for p in patients
+            ])
+        
+        arrival_time = pd.DatetimeIndex(patients['arrival_time'])
+        return pd.DataFrame({
+            'patient_id': 'P' + arrival_time.strftime('%Y%m%d') + '_'
+                          + pd.Index(patients['patient_index']).astype(str).str.zfill(3),
+            'age': patients['age'],
+            'condition': np.array(list(self.conditions))[patients['condition']],
+            'severity': np.array(SEVERITY_LEVELS)[patients['severity']],
+            'wait_time': patients['wait_time'],
+            'treatment_duration': patients['treatment_duration'],
+            'total_time': patients['wait_time'] + patients['treatment_duration'],
+            'cost': patients['cost'],
+            'scenario': scenario
+        })
+
+    def _scenario_metrics(self, patients) -> Dict:
+        """Headline metrics for one scenario from a DataFrame or a dict of columns."""
+        
+        wait_time = np.asarray(patients['wait_time'], dtype=float)
+        treatment_duration = np.asarray(patients['treatment_duration'], dtype=float)
+        cost = np.asarray(patients['cost'], dtype=float)
+        
+        return {
+            'avg_wait_time': wait_time.mean(),
+            'avg_treatment_time': treatment_duration.mean(),
+            'avg_total_time': (wait_time + treatment_duration).mean(),
+            'avg_cost_per_patient': cost.mean(),
+            'total_cost': cost.sum(),
+            'total_patients': len(cost),
         }
+
+    def _improvements(self, metrics: Dict) -> Dict:
+        """Relative improvements and savings of the AI-enabled scenario."""
         
-        improvements = {
+        return {
             'wait_time_reduction': ((metrics['traditional']['avg_wait_time'] - 
                                    metrics['ai_enabled']['avg_wait_time']) / 
                                   metrics['traditional']['avg_wait_time']) * 100,
@@ -241,13 +586,141 @@ class HealthcareSimulator:
                              metrics['traditional']['avg_cost_per_patient']) * 100,
             'total_cost_savings': metrics['traditional']['total_cost'] - metrics['ai_enabled']['total_cost']
         }
+
+    def summarize_results(self, simulation_results: Dict) -> Dict:
+        """Key metrics and improvements without building per-patient DataFrames."""
+        
+        metrics = {}
+        for scenario in ('traditional', 'ai_enabled'):
+            patients = simulation_results[scenario]
+            if isinstance(patients, list):
+                patients = self._patients_frame(patients, scenario)
+            metrics[scenario] = self._scenario_metrics(patients)
+        
+        return {'metrics': metrics, 'improvements': self._improvements(metrics)}
+
+    def _batches_frame(self, batches: Dict[str, PatientBatch]) -> pd.DataFrame:
+        """One DataFrame over several scenario batches, with a categorical ``scenario`` column."""
+        
+        combined = PatientBatch.concat(list(batches.values()))
+        frame = combined.to_frame()
+        frame['total_time'] = combined.wait_time + combined.treatment_duration
+        scenario_codes = np.repeat(np.arange(len(batches), dtype=np.int8), [len(b) for b in batches.values()])
+        frame['scenario'] = pd.Categorical.from_codes(scenario_codes, categories=list(batches))
+        return frame
+
+    def grouped_metrics(self, simulation_results: Dict, by: Sequence[str] = DIMENSIONS,
+                        quantiles: Sequence[float] = (0.5, 0.9, 0.99)) -> pd.DataFrame:
+        """Breakdowns by condition, severity, age band and arrival hour for both scenarios.
+        
+        See ``analysis.grouped_metrics.grouped_metrics``; results must hold
+        ``PatientBatch`` scenarios as returned by ``run_comparative_simulation``.
+        """
+        
+        batches = {'Traditional': simulation_results['traditional'],
+                   'AI-Enabled': simulation_results['ai_enabled']}
+        return grouped_metrics(batches, by=by, quantiles=quantiles, age_bands=list(self.age_weights))
+
+    def build_report(self, simulation_results, path: str = 'simulation_report.html', **kwargs) -> Dict:
+        """Write an HTML report of pre-binned charts and summary tables.
+        
+        Takes ``PatientBatch`` results, a chunk stream or a sink directory and
+        replaces plotting ``combined_data`` row by row; see
+        ``analysis.reporting.build_report``.
+        """
+        
+        return build_report(simulation_results, path, **kwargs)
+
+    def analyze_results(self, simulation_results) -> Dict:
+        """Analyze simulation results and calculate key metrics.
+        
+        Scenarios may be lists of ``Patient`` objects or ``PatientBatch`` columns;
+        for batches ``combined_data`` is built from zero-copy column views, with
+        categorical conditions and severities and without string patient ids.
+        
+        ``simulation_results`` may also be a chunk stream from
+        ``iter_comparative_simulation`` or a directory written by a sink in
+        ``analysis.sinks``; these are aggregated in a single pass and
+        ``combined_data`` is ``None``.
+        
+        ``combined_data`` has one row per patient and is meant for tabular
+        analysis; for charts use ``build_report``, whose size does not grow
+        with the number of patients.
+        """
+        
+        if isinstance(simulation_results, (str, os.PathLike)):
+            simulation_results = read_stream(simulation_results)
+        if not isinstance(simulation_results, dict):
+            running_metrics = RunningMetrics()
+            for chunk in simulation_results:
+                running_metrics.update(chunk)
+            metrics = running_metrics.metrics()
+            return {'metrics': metrics, 'improvements': self._improvements(metrics), 'combined_data': None}
+        
+        traditional = simulation_results['traditional']
+        ai_enabled = simulation_results['ai_enabled']
+        
+        if isinstance(traditional, PatientBatch) and isinstance(ai_enabled, PatientBatch):
+            metrics = {
+                'traditional': self._scenario_metrics(traditional),
+                'ai_enabled': self._scenario_metrics(ai_enabled)
+            }
+            combined_data = self._batches_frame({'Traditional': traditional, 'AI-Enabled': ai_enabled})
+        else:
+            trad_df = self._patients_frame(traditional, 'Traditional')
+            ai_df = self._patients_frame(ai_enabled, 'AI-Enabled')
+            
+            metrics = {
+                'traditional': self._scenario_metrics(trad_df),
+                'ai_enabled': self._scenario_metrics(ai_df)
+            }
+            combined_data = pd.concat([trad_df, ai_df], ignore_index=True)
         
         return {
             'metrics': metrics,
-            'improvements': improvements,
-            'combined_data': pd.concat([trad_df, ai_df], ignore_index=True)
+            'improvements': self._improvements(metrics),
+            'combined_data': combined_data
         }
 
+def _concat_columns(chunks: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Concatenate per-day or per-block column dicts in order."""
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+def _simulate_days(simulator: HealthcareSimulator, start_date: datetime, days: List[int],
+                   seeds: List[np.random.SeedSequence], paired: bool, day_kwargs: Dict,
+                   hooks: SimulationHooks = NULL_HOOKS):
+    """Simulate a block of days for both scenarios; runs in worker processes."""
+    
+    traditional, ai_enabled = [], []
+    for day, seed in zip(days, seeds):
+        current_date = start_date + timedelta(days=day)
+        if paired:
+            traditional_day, ai_day = simulator.simulate_paired_day_arrays(
+                current_date, rng=np.random.default_rng(seed), hooks=hooks, **day_kwargs)
+        else:
+            traditional_seed, ai_seed = seed.spawn(2)
+            traditional_day = simulator.simulate_day_arrays(
+                current_date, ai_enabled=False, rng=np.random.default_rng(traditional_seed), hooks=hooks,
+                **day_kwargs)
+            ai_day = simulator.simulate_day_arrays(
+                current_date, ai_enabled=True, rng=np.random.default_rng(ai_seed), hooks=hooks,
+                **day_kwargs)
+        traditional.append(traditional_day)
+        ai_enabled.append(ai_day)
+    
+    condition_names = list(simulator.conditions.keys())
+    with hooks.phase('assemble'):
+        return (PatientBatch.from_columns(_concat_columns(traditional), condition_names, SEVERITY_LEVELS),
+                PatientBatch.from_columns(_concat_columns(ai_enabled), condition_names, SEVERITY_LEVELS))
+
+def _simulate_days_instrumented(simulator: HealthcareSimulator, start_date: datetime, days: List[int],
+                                seeds: List[np.random.SeedSequence], paired: bool, day_kwargs: Dict):
+    """``_simulate_days`` with its own ``Instrumentation``, returned for the parent to merge."""
+    
+    hooks = Instrumentation()
+    result = _simulate_days(simulator, start_date, days, seeds, paired, day_kwargs, hooks)
+    return result, hooks.metrics()
+
 def main():
     """Main function to run the healthcare simulation and analysis."""
     
@@ -271,6 +744,12 @@ def main():
     print(f"💵 Total Cost Savings (30 days): ¥{improvements['total_cost_savings']:,.0f}")
     print(f"📈 Annualized Savings: ¥{improvements['total_cost_savings'] * 365 / 30:,.0f}")
     
+    print("\nRunning replications for confidence intervals...")
+    replication = run_replications(simulator, replications=20, days=30)
+    savings = replication['metrics']['total_cost_savings']
+    print(f"💵 30-Day Savings, {replication['confidence']:.0%} CI: ¥{savings['ci_low']:,.0f} – ¥{savings['ci_high']:,.0f} "
+          f"({replication['replications']} replications)")
+    
     annual_savings = improvements['total_cost_savings'] * 365 / 30
     implementation_cost = 250_000_000
     five_year_savings = annual_savings * 5 * 1.1
@@ -0,0 +1,140 @@
+# Industry Coefficient Registry
+# JSON-defined industry benefit formulas compiled into coefficient arrays
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# The ROI model's coefficients are the ``roi_model`` section of the market data file
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'data', 'market_data.json')
+
+
+@dataclass(eq=False)
+class CompiledIndustries:
+    """Industry coefficients as arrays, one row per industry in ``names`` order.
+
+    ``benefit_matrix[i, j]`` is the share of revenue gained through improvement
+    ``metrics[j]`` (revenue share × improvement / 100), so annual benefits for a
+    batch of companies are ``revenues * benefit_coefficients[codes]``, where
+    ``benefit_coefficients`` are the row sums of the matrix.
+    """
+
+    names: List[str]
+    metrics: List[str]
+    benefit_matrix: np.ndarray
+    benefit_coefficients: np.ndarray
+    implementation_cost: np.ndarray
+    payback_period: np.ndarray
+
+    def codes(self, industries) -> np.ndarray:
+        """Row index of each industry, raising ``ValueError`` for unknown ones."""
+
+        names, inverse = np.unique(np.asarray(industries), return_inverse=True)
+        unknown = set(names.tolist()) - set(self.names)
+        if unknown:
+            raise ValueError(f"Industry {sorted(unknown)[0]} not supported")
+        rows = np.array([self.names.index(name) for name in names.tolist()], dtype=np.intp)
+        return rows[inverse.ravel()]
+
+
+class IndustryRegistry:
+    """Industry coefficients and benefit formulas, loaded from JSON.
+
+    Each industry has ``data`` (its coefficients, improvements in percent) and
+    ``benefit_revenue_shares``, mapping each improvement coefficient that yields
+    benefits to the share of revenue it applies to. Adding an industry to the
+    JSON file, or through ``register``, needs no code change.
+
+    ``compile()`` is cached and rebuilt after ``register`` or when a
+    coefficient it uses changes, including edits made in place to
+    ``industry_data``.
+    """
+
+    def __init__(self, industries: Dict[str, Dict]):
+        self.industry_data = {}
+        self.benefit_revenue_shares = {}
+        self._version = 0
+        self._key_fields = []
+        self._compiled = None
+        self._compiled_key = None
+        for name, spec in industries.items():
+            self.register(name, spec['data'], spec['benefit_revenue_shares'])
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'IndustryRegistry':
+        """Registry from the ``roi_model`` section of a market data file.
+        
+        Industries without an ``implementation_cost`` take the file's
+        ``implementation_costs[industry]['cost_per_1000_employees']``.
+        """
+        with open(path or DEFAULT_REGISTRY_PATH) as f:
+            market_data = json.load(f)
+        costs = market_data.get('implementation_costs', {})
+        
+        industries = {}
+        for name, spec in market_data['roi_model']['industries'].items():
+            data = dict(spec['data'])
+            if 'implementation_cost' not in data and name.lower() in costs:
+                data['implementation_cost'] = costs[name.lower()]['cost_per_1000_employees']
+            industries[name] = {**spec, 'data': data}
+        return cls(industries)
+
+    def register(self, name: str, data: Dict, benefit_revenue_shares: Dict[str, float]):
+        """Add or replace an industry."""
+
+        missing = [key for key in list(benefit_revenue_shares) + ['implementation_cost', 'payback_period']
+                   if key not in data]
+        if missing:
+            raise ValueError(f"Industry {name} is missing coefficients {missing}")
+        self.industry_data[name] = dict(data)
+        self.benefit_revenue_shares[name] = dict(benefit_revenue_shares)
+        self._key_fields = [(industry, field) for industry, shares in self.benefit_revenue_shares.items()
+                            for field in [*shares, 'implementation_cost', 'payback_period']]
+        self.invalidate()
+
+    def invalidate(self):
+        """Rebuild the compiled tables on the next ``compile()``."""
+        self._version += 1
+
+    def _key(self) -> tuple:
+        """Registry version and every coefficient ``compile()`` reads."""
+        data = self.industry_data
+        return (self._version, *[data[industry][field] for industry, field in self._key_fields])
+
+    def __contains__(self, industry) -> bool:
+        return industry in self.industry_data
+
+    def benefit_coefficient(self, industry: str, data: Optional[Dict] = None) -> float:
+        """Annual benefits per unit of revenue, optionally with overridden coefficients."""
+
+        if data is None:
+            data = self.industry_data[industry]
+        return sum(share * (data[metric] / 100) for metric, share in self.benefit_revenue_shares[industry].items())
+
+    def compile(self) -> CompiledIndustries:
+        key = self._key()
+        if key == self._compiled_key:
+            return self._compiled
+
+        names = list(self.industry_data)
+        metrics = list(dict.fromkeys(metric for name in names for metric in self.benefit_revenue_shares[name]))
+        benefit_matrix = np.zeros((len(names), len(metrics)))
+        for i, name in enumerate(names):
+            for metric, share in self.benefit_revenue_shares[name].items():
+                benefit_matrix[i, metrics.index(metric)] = share * (self.industry_data[name][metric] / 100)
+
+        self._compiled = CompiledIndustries(
+            names=names,
+            metrics=metrics,
+            benefit_matrix=benefit_matrix,
+            benefit_coefficients=benefit_matrix.sum(axis=1),
+            implementation_cost=np.array([self.industry_data[name]['implementation_cost'] for name in names],
+                                         dtype=float),
+            payback_period=np.array([self.industry_data[name]['payback_period'] for name in names]),
+        )
+        self._compiled_key = key
+        return self._compiled
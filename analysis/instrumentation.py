@@ -0,0 +1,194 @@
+# Simulation Instrumentation
+# Callback-based phase timers, counters and progress reporting for the simulation pipeline
+
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional
+
+_NULL_PHASE = nullcontext()
+
+
+class SimulationHooks:
+    """No-op hooks; the default when a run is neither verbose nor instrumented.
+    
+    Every method is cheap enough to call once per simulated day or block.
+    """
+
+    enabled = False
+
+    def start(self, total_days: int):
+        pass
+
+    def phase(self, name: str):
+        return _NULL_PHASE
+
+    def count(self, name: str, value: float = 1):
+        pass
+
+    def gauge_max(self, name: str, value: float):
+        pass
+
+    def progress(self, completed_days: int, total_days: int):
+        pass
+
+    def merge(self, metrics: Optional[Dict]):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_HOOKS = SimulationHooks()
+
+
+class ProgressPrinter(SimulationHooks):
+    """Prints the simulation start and every ``every`` completed days."""
+
+    def __init__(self, every: int = 10):
+        self.every = every
+
+    def start(self, total_days: int):
+        print(f"Running {total_days}-day hospital simulation...")
+
+    def progress(self, completed_days: int, total_days: int):
+        if completed_days % self.every == 0:
+            print(f"Completed {completed_days} days...")
+
+
+class Instrumentation(ProgressPrinter):
+    """Per-phase timers, counters and high-water gauges with optional exports.
+    
+    ``callbacks`` receive ``(event, payload)`` for ``'start'``, ``'progress'``,
+    ``'phase'`` and ``'finish'`` events. With ``trace_memory`` the run is traced
+    with ``tracemalloc`` and the peak and top allocation sites are reported; only
+    the calling process is traced. ``export_path`` is written on ``finish`` as
+    JSON, or as Prometheus text when it ends in ``.prom`` or ``.txt``.
+    """
+
+    enabled = True
+
+    def __init__(self, callbacks: Optional[List[Callable[[str, Dict], None]]] = None,
+                 print_progress: bool = False, every: int = 10, trace_memory: bool = False,
+                 export_path: Optional[str] = None):
+        super().__init__(every)
+        self.callbacks = list(callbacks or [])
+        self.print_progress = print_progress
+        self.trace_memory = trace_memory
+        self.export_path = export_path
+        self.phase_seconds = defaultdict(float)
+        self.phase_calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.gauges = {}
+        self.memory = None
+        self._started_at = None
+        self._elapsed = None
+
+    def _emit(self, event: str, payload: Dict):
+        for callback in self.callbacks:
+            callback(event, payload)
+
+    def start(self, total_days: int):
+        self._started_at = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.print_progress:
+            super().start(total_days)
+        self._emit('start', {'total_days': total_days})
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phase_seconds[name] += elapsed
+            self.phase_calls[name] += 1
+            if self.callbacks:
+                self._emit('phase', {'phase': name, 'seconds': elapsed})
+
+    def count(self, name: str, value: float = 1):
+        self.counters[name] += value
+
+    def gauge_max(self, name: str, value: float):
+        if value > self.gauges.get(name, float('-inf')):
+            self.gauges[name] = value
+
+    def progress(self, completed_days: int, total_days: int):
+        if self.print_progress:
+            super().progress(completed_days, total_days)
+        self._emit('progress', {'completed_days': completed_days, 'total_days': total_days})
+
+    def merge(self, metrics: Optional[Dict]):
+        """Fold in the ``metrics()`` of an instrumented worker process."""
+        if not metrics:
+            return
+        for name, phase in metrics['phases'].items():
+            self.phase_seconds[name] += phase['seconds']
+            self.phase_calls[name] += phase['calls']
+        for name, value in metrics['counters'].items():
+            self.counters[name] += value
+        for name, value in metrics['gauges'].items():
+            self.gauge_max(name, value)
+
+    def finish(self):
+        if self._started_at is not None:
+            self._elapsed = time.perf_counter() - self._started_at
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            self.memory = {
+                'peak_bytes': tracemalloc.get_traced_memory()[1],
+                'top_allocations': [
+                    {'location': str(stat.traceback), 'bytes': stat.size}
+                    for stat in snapshot.statistics('lineno')[:10]
+                ],
+            }
+            tracemalloc.stop()
+        self._emit('finish', self.metrics())
+        if self.export_path:
+            if self.export_path.endswith(('.prom', '.txt')):
+                self.export_prometheus(self.export_path)
+            else:
+                self.export_json(self.export_path)
+
+    def metrics(self) -> Dict:
+        metrics = {
+            'phases': {name: {'seconds': self.phase_seconds[name], 'calls': self.phase_calls[name]}
+                       for name in self.phase_seconds},
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+        }
+        if self._elapsed:
+            metrics['elapsed_seconds'] = self._elapsed
+            metrics['patients_per_second'] = self.counters.get('patients_generated', 0) / self._elapsed
+        if self.memory is not None:
+            metrics['memory'] = self.memory
+        return metrics
+
+    def export_json(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.metrics(), f, indent=2)
+
+    def export_prometheus(self, path: str, prefix: str = 'healthcare_simulation'):
+        metrics = self.metrics()
+        lines = [f"# TYPE {prefix}_phase_seconds_total counter"]
+        lines += [f'{prefix}_phase_seconds_total{{phase="{name}"}} {phase["seconds"]}'
+                  for name, phase in metrics['phases'].items()]
+        lines.append(f"# TYPE {prefix}_phase_calls_total counter")
+        lines += [f'{prefix}_phase_calls_total{{phase="{name}"}} {phase["calls"]}'
+                  for name, phase in metrics['phases'].items()]
+        for name, value in metrics['counters'].items():
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {value}"]
+        for name, value in metrics['gauges'].items():
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value}"]
+        for name in ('elapsed_seconds', 'patients_per_second'):
+            if name in metrics:
+                lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {metrics[name]}"]
+        if 'memory' in metrics:
+            lines += [f"# TYPE {prefix}_memory_peak_bytes gauge",
+                      f"{prefix}_memory_peak_bytes {metrics['memory']['peak_bytes']}"]
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
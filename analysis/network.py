@@ -0,0 +1,272 @@
+# Hospital Network Simulation
+# AI rollout across many facilities, partitioned over a process pool with shared-memory arrays
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from analysis.healthcare_simulation import HealthcareSimulator, _simulate_days
+from analysis.instrumentation import NULL_HOOKS, Instrumentation, ProgressPrinter, SimulationHooks
+from analysis.queueing import QUEUE_MODELS
+from analysis.sinks import SCENARIOS, RunningMetrics, batch_totals
+
+# Last axis of the per-facility results array, as produced by ``batch_totals``
+RESULT_FIELDS = ('patients', 'wait_time', 'treatment_duration', 'cost')
+
+
+class _SharedArrays:
+    """Named NumPy arrays in ``multiprocessing.shared_memory`` blocks.
+    
+    The parent creates (and finally unlinks) the blocks; pool workers attach by
+    ``spec``, so parameters and results are never pickled between processes.
+    """
+
+    def __init__(self, blocks: Dict, spec: Dict, owner: bool):
+        self._blocks = blocks
+        self._owner = owner
+        self.spec = spec
+        self.arrays = {name: np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+                       for name, (_, shape, dtype) in spec.items()}
+
+    @classmethod
+    def create(cls, arrays: Dict[str, np.ndarray]) -> '_SharedArrays':
+        blocks, spec = {}, {}
+        for name, array in arrays.items():
+            blocks[name] = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            spec[name] = (blocks[name].name, array.shape, array.dtype.str)
+        shared = cls(blocks, spec, owner=True)
+        for name, array in arrays.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, spec: Dict) -> '_SharedArrays':
+        blocks = {name: shared_memory.SharedMemory(name=block_name) for name, (block_name, _, _) in spec.items()}
+        return cls(blocks, spec, owner=False)
+
+    def close(self):
+        self.arrays = {}
+        for block in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+
+
+class NetworkProgressPrinter(ProgressPrinter):
+    """Prints the network run's start and the facilities completed after each partition."""
+
+    def __init__(self, days: int, workers: int):
+        super().__init__()
+        self.days = days
+        self.workers = workers
+
+    def start(self, total_facilities: int):
+        print(f"Running {self.days}-day simulation of {total_facilities} facilities "
+              f"on {self.workers} worker(s)...")
+
+    def progress(self, completed_facilities: int, total_facilities: int):
+        print(f"Completed {completed_facilities}/{total_facilities} facilities...")
+
+
+class HospitalNetwork:
+    """A network of facilities with their own daily volume, treatment capacity and case mix.
+    
+    ``condition_mix`` holds one weight per facility and condition that reweights
+    the simulator's age-specific condition mix; ones keep it unchanged.
+    """
+
+    def __init__(self, volumes: Sequence[int], servers: Sequence[int],
+                 condition_mix: Optional[np.ndarray] = None,
+                 simulator: Optional[HealthcareSimulator] = None):
+        self.simulator = simulator or HealthcareSimulator()
+        self.volumes = np.asarray(volumes, dtype=np.int64)
+        self.servers = np.asarray(servers, dtype=np.int64)
+        
+        n_conditions = len(self.simulator.conditions)
+        if condition_mix is None:
+            condition_mix = np.ones((len(self.volumes), n_conditions))
+        self.condition_mix = np.asarray(condition_mix, dtype=float)
+        
+        if len(self.servers) != len(self.volumes):
+            raise ValueError("volumes and servers must have one entry per facility")
+        if self.condition_mix.shape != (len(self.volumes), n_conditions):
+            raise ValueError(f"condition_mix must have shape ({len(self.volumes)}, {n_conditions})")
+
+    @classmethod
+    def synthetic(cls, facilities: int, seed: Optional[int] = None, mean_volume: float = 200,
+                  patients_per_server: float = 20, mix_concentration: float = 20.0,
+                  simulator: Optional[HealthcareSimulator] = None) -> 'HospitalNetwork':
+        """Random network with log-normal volumes, proportional capacity and Dirichlet case mixes."""
+        
+        simulator = simulator or HealthcareSimulator()
+        n_conditions = len(simulator.conditions)
+        rng = np.random.default_rng(seed)
+        
+        volumes = np.maximum(20, rng.lognormal(np.log(mean_volume), 0.5, size=facilities)).astype(np.int64)
+        servers = np.maximum(1, np.round(volumes / patients_per_server)).astype(np.int64)
+        condition_mix = rng.dirichlet(np.full(n_conditions, mix_concentration), size=facilities) * n_conditions
+        return cls(volumes, servers, condition_mix, simulator)
+
+    def __len__(self) -> int:
+        return len(self.volumes)
+
+    def iter_simulation(self, days: int = 365, seed: Optional[Union[int, np.random.SeedSequence]] = None,
+                        workers: Optional[int] = None, partition_size: Optional[int] = None,
+                        queue_model: str = 'legacy', paired: bool = False,
+                        verbose: bool = False,
+                        hooks: Optional[SimulationHooks] = None) -> Iterator[Dict]:
+        """Yield network-wide metrics as partitions of facilities complete.
+        
+        Each item holds ``facilities`` (the ``(start, stop)`` range just
+        finished), their ``results`` (facilities × scenarios × ``RESULT_FIELDS``)
+        and ``metrics`` rolled up over every facility finished so far. Partitions
+        finish in any order. Facility ``f`` draws from the ``f``-th child of
+        ``SeedSequence(seed)``, so results do not depend on ``workers`` or
+        ``partition_size``.
+        
+        ``hooks`` receive ``start`` and ``progress`` counted in facilities, once
+        per partition, and the phase timings and counters of every partition,
+        including those run in worker processes; they default to printing when
+        ``verbose``. Stream consumers call ``hooks.finish()`` themselves.
+        """
+        
+        if queue_model not in QUEUE_MODELS:
+            raise ValueError(f"Unknown queue model {queue_model!r}, expected one of {QUEUE_MODELS}")
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        if workers is None or workers < 1:
+            workers = 1
+        
+        facilities = len(self)
+        if partition_size is None:
+            partition_size = max(1, -(-facilities // (workers * 8)))
+        partitions = [(start, min(start + partition_size, facilities))
+                      for start in range(0, facilities, partition_size)]
+        
+        settings = {'days': days, 'seed': seed, 'queue_model': queue_model, 'paired': paired,
+                    'start_date': datetime(2025, 1, 1)}
+        arrays = {
+            'volume': self.volumes,
+            'servers': self.servers,
+            'condition_mix': self.condition_mix,
+            'results': np.zeros((facilities, len(SCENARIOS), len(RESULT_FIELDS))),
+        }
+        
+        if hooks is None:
+            hooks = NetworkProgressPrinter(days, workers) if verbose else NULL_HOOKS
+        hooks.start(facilities)
+        
+        running_metrics = RunningMetrics()
+        completed = 0
+        
+        def rollup(start, stop, results):
+            nonlocal completed
+            completed += stop - start
+            for s, scenario in enumerate(SCENARIOS):
+                running_metrics.update_totals(scenario, results[start:stop, s].sum(axis=0))
+            hooks.progress(completed, facilities)
+            return {'facilities': (start, stop), 'results': results[start:stop].copy(),
+                    'metrics': running_metrics.metrics()}
+        
+        if workers == 1:
+            for start, stop in partitions:
+                _simulate_facilities(self.simulator, arrays, settings, start, stop, hooks)
+                yield rollup(start, stop, arrays['results'])
+            return
+        
+        shared = _SharedArrays.create(arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_network_worker,
+                                     initargs=(self.simulator, shared.spec, settings)) as executor:
+                futures = [executor.submit(_run_partition, start, stop, hooks.enabled) for start, stop in partitions]
+                for future in as_completed(futures):
+                    start, stop, metrics = future.result()
+                    hooks.merge(metrics)
+                    yield rollup(start, stop, shared.arrays['results'])
+        finally:
+            shared.close()
+
+    def run_simulation(self, days: int = 365, seed: Optional[Union[int, np.random.SeedSequence]] = None,
+                       workers: Optional[int] = None, partition_size: Optional[int] = None,
+                       queue_model: str = 'legacy', paired: bool = False, verbose: bool = True,
+                       hooks: Optional[SimulationHooks] = None) -> Dict:
+        """Simulate every facility for ``days`` days under both scenarios.
+        
+        Returns network ``metrics`` and ``improvements`` in the shape of
+        ``HealthcareSimulator.analyze_results`` plus a per-facility DataFrame.
+        ``hooks`` are as for ``iter_simulation``; an ``Instrumentation`` is
+        finished once the results are assembled.
+        """
+        
+        if hooks is None:
+            hooks = NetworkProgressPrinter(days, workers or 1) if verbose else NULL_HOOKS
+        
+        results = np.zeros((len(self), len(SCENARIOS), len(RESULT_FIELDS)))
+        metrics = {}
+        for chunk in self.iter_simulation(days, seed=seed, workers=workers, partition_size=partition_size,
+                                          queue_model=queue_model, paired=paired, hooks=hooks):
+            start, stop = chunk['facilities']
+            results[start:stop] = chunk['results']
+            metrics = chunk['metrics']
+        hooks.finish()
+        
+        return {
+            'metrics': metrics,
+            'improvements': self.simulator._improvements(metrics),
+            'facilities': self.facility_frame(results),
+            'simulation_period': f"{days} days"
+        }
+
+    def facility_frame(self, results: np.ndarray) -> pd.DataFrame:
+        """Per-facility parameters and scenario metrics from a results array."""
+        
+        frame = pd.DataFrame({'volume': self.volumes, 'servers': self.servers})
+        for s, scenario in enumerate(SCENARIOS):
+            patients, wait_time, treatment_duration, cost = (results[:, s, i] for i in range(len(RESULT_FIELDS)))
+            frame[f'{scenario}_avg_wait_time'] = wait_time / patients
+            frame[f'{scenario}_avg_treatment_time'] = treatment_duration / patients
+            frame[f'{scenario}_total_cost'] = cost
+        frame['cost_savings'] = frame['traditional_total_cost'] - frame['ai_enabled_total_cost']
+        return frame
+
+
+def _simulate_facilities(simulator: HealthcareSimulator, arrays: Dict[str, np.ndarray], settings: Dict,
+                         start: int, stop: int, hooks: SimulationHooks = NULL_HOOKS):
+    """Simulate facilities ``start:stop`` and write their totals into ``arrays['results']``."""
+    
+    seed = settings['seed']
+    days = list(range(settings['days']))
+    for f in range(start, stop):
+        facility_seed = np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (f,))
+        day_kwargs = {
+            'num_patients': int(arrays['volume'][f]),
+            'servers': int(arrays['servers'][f]),
+            'queue_model': settings['queue_model'],
+            'condition_weights': arrays['condition_mix'][f],
+        }
+        batches = _simulate_days(simulator, settings['start_date'], days, facility_seed.spawn(len(days)),
+                                 settings['paired'], day_kwargs, hooks)
+        for s, batch in enumerate(batches):
+            arrays['results'][f, s] = batch_totals(batch)
+
+
+_worker_state = {}
+
+
+def _init_network_worker(simulator: HealthcareSimulator, spec: Dict, settings: Dict):
+    """Pool initializer: attach the shared arrays once per worker process."""
+    _worker_state['simulator'] = simulator
+    _worker_state['shared'] = _SharedArrays.attach(spec)
+    _worker_state['settings'] = settings
+
+
+def _run_partition(start: int, stop: int, instrumented: bool = False):
+    """Simulate one partition in a worker, with its own ``Instrumentation`` metrics when ``instrumented``."""
+    hooks = Instrumentation() if instrumented else NULL_HOOKS
+    _simulate_facilities(_worker_state['simulator'], _worker_state['shared'].arrays,
+                         _worker_state['settings'], start, stop, hooks)
+    return start, stop, hooks.metrics() if instrumented else None
@@ -0,0 +1,193 @@
+# Capacity & AI Adoption Optimizer
+# Noisy-objective search over treatment capacity and AI-assisted share of patients
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analysis.replication import RunningStats
+
+
+def _stats(values: Iterable[float]) -> RunningStats:
+    stats = RunningStats(quantiles=())
+    for value in values:
+        stats.update(value)
+    return stats
+
+
+class CapacityOptimizer:
+    """Cheapest treatment capacity and AI-assisted share meeting a wait-time target.
+    
+    A candidate is a number of ``servers`` (parallel treatment slots) and an
+    ``ai_fraction`` of patients treated with AI assistance. Replication ``r`` of
+    every candidate simulates ``days`` days from the same random stream (common
+    random numbers), so candidates differ only through their decisions and are
+    compared on paired replications.
+    
+    For each AI share, the smallest capacity whose mean daily wait-time quantile
+    stays under ``target_wait`` is found by bisection, with each feasibility
+    check adding replications only until the confidence interval clears the
+    target. The per-share optima are then raced on daily cost: replications are
+    doubled only for candidates that cannot yet be told apart from the best.
+    
+    Daily cost is the simulated patient cost plus ``server_cost_per_day`` per
+    slot and ``ai_cost_per_patient`` per AI-assisted patient.
+    """
+
+    def __init__(self, simulator, num_patients: int = 200, target_wait: float = 20,
+                 wait_quantile: float = 0.9, queue_model: str = 'fifo', days: int = 1,
+                 server_cost_per_day: float = 120_000, ai_cost_per_patient: float = 8_000,
+                 confidence: float = 0.95, min_replications: int = 5, max_replications: int = 64,
+                 seed: Optional[int] = None):
+        self.simulator = simulator
+        self.num_patients = num_patients
+        self.target_wait = target_wait
+        self.wait_quantile = wait_quantile
+        self.queue_model = queue_model
+        self.days = days
+        self.server_cost_per_day = server_cost_per_day
+        self.ai_cost_per_patient = ai_cost_per_patient
+        self.confidence = confidence
+        self.min_replications = min_replications
+        self.max_replications = max_replications
+        self.seed = np.random.SeedSequence(seed)
+        self.start_date = datetime(2025, 1, 1)
+        self._evaluations = {}
+
+    @property
+    def evaluations(self) -> int:
+        """Simulated replications so far; repeated requests are served from memory."""
+        return len(self._evaluations)
+
+    def evaluate(self, servers: int, ai_fraction: float, replication: int) -> Tuple[float, float]:
+        """Wait-time quantile and mean daily cost of one replication of a candidate."""
+        
+        key = (servers, float(ai_fraction), replication)
+        if key not in self._evaluations:
+            rng = np.random.default_rng(
+                np.random.SeedSequence(self.seed.entropy, spawn_key=self.seed.spawn_key + (replication,)))
+            waits, cost, assisted = [], 0.0, 0
+            for day in range(self.days):
+                patients = self.simulator.simulate_day_arrays(
+                    self.start_date + timedelta(days=day), num_patients=self.num_patients, rng=rng,
+                    queue_model=self.queue_model, servers=servers, ai_fraction=ai_fraction)
+                waits.append(patients['wait_time'])
+                cost += patients['cost'].sum()
+                assisted += int(patients['ai_assisted'].sum())
+            daily_cost = (cost + assisted * self.ai_cost_per_patient) / self.days + servers * self.server_cost_per_day
+            self._evaluations[key] = (float(np.quantile(np.concatenate(waits), self.wait_quantile)), daily_cost)
+        return self._evaluations[key]
+
+    def is_feasible(self, servers: int, ai_fraction: float) -> bool:
+        """Whether the mean wait-time quantile is below ``target_wait``, with sequential stopping.
+        
+        Replications are added until the confidence interval lies entirely on
+        one side of the target, or ``max_replications`` is reached, when the
+        mean decides.
+        """
+        
+        stats = RunningStats(quantiles=())
+        for replication in range(self.max_replications):
+            stats.update(self.evaluate(servers, ai_fraction, replication)[0])
+            if stats.count >= self.min_replications:
+                half_width = stats.half_width(self.confidence)
+                if stats.mean + half_width < self.target_wait or stats.mean - half_width > self.target_wait:
+                    break
+        return stats.mean <= self.target_wait
+
+    def min_servers(self, ai_fraction: float, high: int = 1, max_servers: int = 1024) -> Optional[int]:
+        """Smallest feasible capacity for an AI share, or ``None`` up to ``max_servers``.
+        
+        More capacity never lengthens waits on common random numbers, so the
+        search doubles ``high`` until it is feasible and then bisects.
+        """
+        
+        low = 1
+        while not self.is_feasible(high, ai_fraction):
+            if high >= max_servers:
+                return None
+            low, high = high + 1, min(high * 2, max_servers)
+        while low < high:
+            middle = (low + high) // 2
+            if self.is_feasible(middle, ai_fraction):
+                high = middle
+            else:
+                low = middle + 1
+        return high
+
+    def _race(self, candidates: List[Tuple[int, float]]) -> Dict[Tuple[int, float], RunningStats]:
+        """Paired racing on daily cost; returns each candidate's cost statistics when it was last evaluated.
+        
+        Candidates whose paired cost difference to the current best is
+        significantly positive drop out; the rest get twice the replications.
+        """
+        
+        stats = {}
+        survivors = list(candidates)
+        replications = self.min_replications
+        while True:
+            costs = {c: np.array([self.evaluate(*c, r)[1] for r in range(replications)]) for c in survivors}
+            stats.update({c: _stats(costs[c]) for c in survivors})
+            best = min(survivors, key=lambda c: stats[c].mean)
+            
+            remaining = []
+            for candidate in survivors:
+                difference = _stats(costs[candidate] - costs[best])
+                if candidate == best or difference.mean - difference.half_width(self.confidence) <= 0:
+                    remaining.append(candidate)
+            survivors = remaining
+            
+            if len(survivors) == 1 or replications >= self.max_replications:
+                return stats
+            replications = min(replications * 2, self.max_replications)
+
+    def optimize(self, ai_fractions: Sequence[float] = tuple(i / 10 for i in range(11)),
+                 max_servers: int = 1024) -> Dict:
+        """Cheapest ``(servers, ai_fraction)`` meeting the wait-time target.
+        
+        Returns the chosen ``servers`` and ``ai_fraction``, their mean daily cost
+        and wait-time quantile, a ``candidates`` DataFrame with the minimum
+        capacity and cost of every AI share, and the number of simulated
+        replications next to ``grid_evaluations``: a grid over every AI share
+        and capacities up to the largest minimum found, at ``min_replications``
+        per point.
+        """
+        
+        minimum = {}
+        high = 1
+        for ai_fraction in sorted(ai_fractions):
+            # More AI assistance shortens treatments, so the previous optimum is a good first bound
+            minimum[ai_fraction] = self.min_servers(ai_fraction, high=high, max_servers=max_servers)
+            if minimum[ai_fraction] is not None:
+                high = minimum[ai_fraction]
+        
+        feasible = [(servers, f) for f, servers in minimum.items() if servers is not None]
+        if not feasible:
+            raise ValueError(f"No capacity up to {max_servers} keeps the wait-time quantile under {self.target_wait}")
+        cost_stats = self._race(feasible)
+        best = min(feasible, key=lambda c: cost_stats[c].mean)
+        
+        candidates = pd.DataFrame([
+            {'ai_fraction': f, 'servers': servers,
+             'daily_cost': cost_stats[(servers, f)].mean if servers is not None else np.nan,
+             'cost_half_width': cost_stats[(servers, f)].half_width(self.confidence) if servers is not None else np.nan,
+             'replications': cost_stats[(servers, f)].count if servers is not None else 0}
+            for f, servers in minimum.items()
+        ])
+        # Over every replication of the optimum, including those that decided feasibility
+        replications = sum(1 for key in self._evaluations if key[:2] == best)
+        wait = _stats(self.evaluate(*best, r)[0] for r in range(replications))
+        grid_servers = max(servers for servers in minimum.values() if servers is not None)
+        
+        return {
+            'servers': best[0],
+            'ai_fraction': best[1],
+            'daily_cost': float(cost_stats[best].mean),
+            'cost_half_width': cost_stats[best].half_width(self.confidence),
+            'wait_quantile': wait.mean,
+            'candidates': candidates,
+            'evaluations': self.evaluations,
+            'grid_evaluations': len(minimum) * grid_servers * self.min_replications,
+        }
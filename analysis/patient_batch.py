@@ -0,0 +1,154 @@
+# Columnar Patient Store
+# Compact NumPy-backed storage for large simulated patient populations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+_COLUMN_DTYPES = {
+    'age': np.int8,
+    'condition': np.int8,
+    'severity': np.int8,
+    'arrival_minute': np.int64,
+    'patient_index': np.int32,
+    'wait_time': np.float32,
+    'treatment_duration': np.float32,
+    'cost': np.float32,
+    'ai_assisted': np.bool_,
+}
+
+
+@dataclass(eq=False)
+class PatientBatch:
+    """Simulated patients stored column-wise.
+    
+    Conditions and severities are int8 codes into ``condition_names`` and
+    ``severity_names``, arrival times are whole minutes since 1970-01-01 and
+    measures are float32. ``patient_index`` is the generation order within the
+    arrival day, from which patient ids are derived.
+    """
+    age: np.ndarray
+    condition: np.ndarray
+    severity: np.ndarray
+    arrival_minute: np.ndarray
+    patient_index: np.ndarray
+    wait_time: np.ndarray
+    treatment_duration: np.ndarray
+    cost: np.ndarray
+    ai_assisted: np.ndarray
+    condition_names: Sequence[str]
+    severity_names: Sequence[str]
+
+    def __post_init__(self):
+        for name, dtype in _COLUMN_DTYPES.items():
+            setattr(self, name, np.asarray(getattr(self, name), dtype=dtype))
+        self.condition_names = list(self.condition_names)
+        self.severity_names = list(self.severity_names)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], condition_names: Sequence[str],
+                     severity_names: Sequence[str]) -> 'PatientBatch':
+        """Build a batch from the per-attribute arrays of ``simulate_day_arrays``."""
+        arrival_minute = np.asarray(columns['arrival_time']).astype('datetime64[m]').astype(np.int64)
+        patient_index = columns.get('patient_index')
+        if patient_index is None:
+            patient_index = np.arange(len(arrival_minute))
+        return cls(
+            age=columns['age'],
+            condition=columns['condition'],
+            severity=columns['severity'],
+            arrival_minute=arrival_minute,
+            patient_index=patient_index,
+            wait_time=columns['wait_time'],
+            treatment_duration=columns['treatment_duration'],
+            cost=columns['cost'],
+            ai_assisted=columns['ai_assisted'],
+            condition_names=condition_names,
+            severity_names=severity_names
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence['PatientBatch']) -> 'PatientBatch':
+        """Concatenate batches that share the same categories."""
+        first = batches[0]
+        columns = {name: np.concatenate([getattr(batch, name) for batch in batches])
+                   for name in _COLUMN_DTYPES}
+        return cls(condition_names=first.condition_names, severity_names=first.severity_names, **columns)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(_COLUMN_DTYPES)
+
+    @property
+    def arrival_time(self) -> np.ndarray:
+        return self.arrival_minute.view('datetime64[m]')
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in _COLUMN_DTYPES)
+
+    def __len__(self) -> int:
+        return len(self.cost)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name == 'arrival_time':
+            return self.arrival_time
+        if name not in _COLUMN_DTYPES:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def take(self, indices) -> 'PatientBatch':
+        """Rows selected by an index array or boolean mask."""
+        columns = {name: getattr(self, name)[indices] for name in _COLUMN_DTYPES}
+        return PatientBatch(condition_names=self.condition_names, severity_names=self.severity_names, **columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame view over the batch arrays without copying them.
+        
+        Condition and severity become categoricals over the stored codes.
+        """
+        frame = {
+            'age': self.age,
+            'condition': pd.Categorical.from_codes(
+                self.condition, dtype=pd.CategoricalDtype(self.condition_names), validate=False),
+            'severity': pd.Categorical.from_codes(
+                self.severity, dtype=pd.CategoricalDtype(self.severity_names), validate=False),
+            'arrival_minute': self.arrival_minute,
+            'patient_index': self.patient_index,
+            'wait_time': self.wait_time,
+            'treatment_duration': self.treatment_duration,
+            'cost': self.cost,
+            'ai_assisted': self.ai_assisted,
+        }
+        return pd.DataFrame(frame, copy=False)
+
+    def patient_ids(self) -> np.ndarray:
+        """Patient ids in the ``P<YYYYMMDD>_<index>`` form used by ``simulate_hospital_day``."""
+        days = pd.DatetimeIndex(self.arrival_time).strftime('%Y%m%d')
+        return np.asarray('P' + days + '_' + pd.Index(self.patient_index).astype(str).str.zfill(3))
+
+    def patient(self, i: int):
+        """A ``Patient`` object for row ``i``."""
+        from analysis.healthcare_simulation import Patient
+        
+        arrival_time = self.arrival_time[i].astype(datetime)
+        return Patient(
+            id=f"P{arrival_time:%Y%m%d}_{int(self.patient_index[i]):03d}",
+            age=int(self.age[i]),
+            condition=self.condition_names[self.condition[i]],
+            severity=self.severity_names[self.severity[i]],
+            arrival_time=arrival_time,
+            wait_time=float(self.wait_time[i]),
+            treatment_duration=float(self.treatment_duration[i]),
+            cost=float(self.cost[i]),
+            ai_assisted=bool(self.ai_assisted[i])
+        )
+
+    def __iter__(self) -> Iterator:
+        return (self.patient(i) for i in range(len(self)))
+
+    def to_patients(self) -> List:
+        return list(self)
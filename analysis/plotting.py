@@ -0,0 +1,36 @@
+# Plotting Dependencies
+# Deferred imports so the computational APIs only need numpy and pandas
+
+import importlib
+
+# Conventional alias -> (module, attribute)
+PLOTTING_IMPORTS = {
+    'plt': ('matplotlib.pyplot', None),
+    'sns': ('seaborn', None),
+    'px': ('plotly.express', None),
+    'go': ('plotly.graph_objects', None),
+    'make_subplots': ('plotly.subplots', 'make_subplots'),
+    'Figure': ('matplotlib.figure', 'Figure'),
+    'FuncFormatter': ('matplotlib.ticker', 'FuncFormatter'),
+    'NullFormatter': ('matplotlib.ticker', 'NullFormatter'),
+}
+
+
+def load(alias: str):
+    """Import and return a plotting module or function by its conventional alias."""
+    module_name, attribute = PLOTTING_IMPORTS[alias]
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute) if attribute else module
+
+
+def lazy_getattr(module_globals: dict, aliases):
+    """Build a module ``__getattr__`` that loads the given plotting aliases on first use."""
+    
+    def __getattr__(name):
+        if name in aliases:
+            value = load(name)
+            module_globals[name] = value
+            return value
+        raise AttributeError(f"module {module_globals['__name__']!r} has no attribute {name!r}")
+    
+    return __getattr__
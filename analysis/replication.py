@@ -0,0 +1,187 @@
+# Monte Carlo Replication Engine
+# Streaming confidence intervals for repeated hospital simulations
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+class P2Quantile:
+    """Single-pass quantile estimate with five markers (Jain & Chlamtac P² algorithm)."""
+
+    def __init__(self, p: float):
+        self.p = p
+        self._heights = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, x: float):
+        q = self._heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+        
+        n = self._positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+        
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    @property
+    def value(self) -> float:
+        q = self._heights
+        if not q:
+            return math.nan
+        if len(q) < 5:
+            return q[int(round(self.p * (len(q) - 1)))]
+        return q[2]
+
+
+class RunningStats:
+    """Welford mean/variance accumulator with P² quantile sketches."""
+
+    def __init__(self, quantiles: Sequence[float] = (0.05, 0.5, 0.95)):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def update(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        for sketch in self.quantiles.values():
+            sketch.update(x)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def half_width(self, confidence: float = 0.95) -> float:
+        """Half-width of the normal-approximation confidence interval for the mean."""
+        if self.count < 2:
+            return math.inf
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return z * self.std / math.sqrt(self.count)
+
+    def summary(self, confidence: float = 0.95) -> Dict:
+        half_width = self.half_width(confidence)
+        summary = {
+            'mean': self.mean,
+            'std': self.std,
+            'half_width': half_width,
+            'ci_low': self.mean - half_width,
+            'ci_high': self.mean + half_width,
+        }
+        for p, sketch in self.quantiles.items():
+            summary[f"p{round(p * 100):02d}"] = sketch.value
+        return summary
+
+
+def replication_metrics(simulator, days: int, seed, simulation_kwargs: Dict) -> Dict[str, float]:
+    """Flat metrics of one comparative simulation, as reported by ``summarize_results``."""
+    
+    results = simulator.run_comparative_simulation(days, seed=seed, verbose=False, **simulation_kwargs)
+    summary = simulator.summarize_results(results)
+    
+    values = {
+        f"{scenario}_{name}": float(value)
+        for scenario, metrics in summary['metrics'].items()
+        for name, value in metrics.items()
+        if name != 'total_patients'
+    }
+    values.update({name: float(value) for name, value in summary['improvements'].items()})
+    return values
+
+
+def run_replications(simulator, replications: int = 1000, days: int = 30, seed: Optional[int] = None,
+                     confidence: float = 0.95, target_half_width: Optional[float] = None,
+                     target_metric: str = 'total_cost_savings', relative: bool = False,
+                     min_replications: int = 10, workers: Optional[int] = None,
+                     **simulation_kwargs) -> Dict:
+    """Replicate ``run_comparative_simulation`` and aggregate metrics in constant memory.
+    
+    Each replication is seeded from ``SeedSequence(seed).spawn(replications)`` and
+    only its summary metrics are kept, folded into ``RunningStats``. Once
+    ``min_replications`` have run, replication stops early as soon as the
+    confidence-interval half-width of ``target_metric`` is at most
+    ``target_half_width`` (a fraction of the mean when ``relative``). Results are
+    consumed in replication order, so they do not depend on ``workers``.
+    """
+    
+    replication_seeds = np.random.SeedSequence(seed).spawn(replications)
+    stats = {}
+    converged = False
+    
+    def reached_target() -> bool:
+        if target_half_width is None or stats[target_metric].count < min_replications:
+            return False
+        half_width = stats[target_metric].half_width(confidence)
+        if relative:
+            half_width /= abs(stats[target_metric].mean)
+        return half_width <= target_half_width
+    
+    def consume(values: Dict[str, float]) -> bool:
+        if target_metric not in values:
+            raise ValueError(f"Unknown target_metric {target_metric!r}, expected one of {sorted(values)}")
+        for name, value in values.items():
+            stats.setdefault(name, RunningStats()).update(value)
+        return reached_target()
+    
+    if workers is None or workers <= 1:
+        for replication_seed in replication_seeds:
+            if consume(replication_metrics(simulator, days, replication_seed, simulation_kwargs)):
+                converged = True
+                break
+    else:
+        wave = workers * 2
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for first in range(0, replications, wave):
+                futures = [
+                    executor.submit(replication_metrics, simulator, days, replication_seed, simulation_kwargs)
+                    for replication_seed in replication_seeds[first:first + wave]
+                ]
+                for future in futures:
+                    if not converged and consume(future.result()):
+                        converged = True
+                if converged:
+                    break
+    
+    return {
+        'replications': stats[target_metric].count if stats else 0,
+        'converged': converged,
+        'confidence': confidence,
+        'metrics': {name: accumulator.summary(confidence) for name, accumulator in stats.items()}
+    }
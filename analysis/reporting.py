@@ -0,0 +1,248 @@
+# Simulation Reports
+# Pre-binned aggregates rendered into a static HTML report of bounded size
+
+import base64
+import html
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis.patient_batch import PatientBatch
+from analysis.plotting import load
+from analysis.sinks import SCENARIOS, read_stream
+
+SCENARIO_LABELS = {'traditional': 'Traditional', 'ai_enabled': 'AI-Enabled'}
+
+# Fixed histogram edges, so aggregates from any number of chunks can be summed
+HISTOGRAM_EDGES = {
+    'wait_time': np.concatenate([[0.0], np.geomspace(0.1, 100_000, 96)]),
+    'treatment_duration': np.geomspace(1, 10_000, 96),
+    'cost': np.geomspace(1_000, 10_000_000, 96),
+}
+HISTOGRAM_LABELS = {
+    'wait_time': 'Wait time (minutes)',
+    'treatment_duration': 'Treatment duration (minutes)',
+    'cost': 'Cost per patient (¥)',
+}
+
+TIME_OF_DAY_MINUTES = 15
+
+
+class ReportAggregates:
+    """Fixed-size per-scenario histograms, time-of-day curves and condition sums.
+    
+    Histogram counts include an underflow and an overflow bin around
+    ``HISTOGRAM_EDGES``. Aggregates are updated one batch at a time and their
+    size does not depend on the number of patients.
+    """
+
+    def __init__(self):
+        self.condition_names = None
+        self.histograms = {}
+        self.time_of_day = {}
+        self.conditions = {}
+
+    @classmethod
+    def from_results(cls, simulation_results) -> 'ReportAggregates':
+        """Aggregate ``PatientBatch`` results, a chunk stream or a sink directory."""
+        
+        aggregates = cls()
+        if isinstance(simulation_results, (str, os.PathLike)):
+            simulation_results = read_stream(simulation_results)
+        if isinstance(simulation_results, dict):
+            simulation_results = [simulation_results]
+        for chunk in simulation_results:
+            aggregates.update(chunk)
+        return aggregates
+
+    def update(self, chunk: Dict):
+        for scenario in SCENARIOS:
+            if scenario in chunk:
+                self.update_batch(scenario, chunk[scenario])
+
+    def update_batch(self, scenario: str, batch: PatientBatch):
+        if self.condition_names is None:
+            self.condition_names = list(batch.condition_names)
+        n_conditions = len(self.condition_names)
+        n_buckets = 1440 // TIME_OF_DAY_MINUTES
+        
+        histograms = self.histograms.setdefault(
+            scenario, {name: np.zeros(len(edges) + 1, dtype=np.int64) for name, edges in HISTOGRAM_EDGES.items()})
+        for name, edges in HISTOGRAM_EDGES.items():
+            histograms[name] += np.bincount(np.searchsorted(edges, batch[name], side='right'),
+                                            minlength=len(edges) + 1)
+        
+        bucket = (batch.arrival_minute % 1440) // TIME_OF_DAY_MINUTES
+        time_of_day = self.time_of_day.setdefault(scenario, np.zeros((2, n_buckets)))
+        time_of_day[0] += np.bincount(bucket, minlength=n_buckets)
+        time_of_day[1] += np.bincount(bucket, weights=batch.wait_time, minlength=n_buckets)
+        
+        conditions = self.conditions.setdefault(scenario, np.zeros((4, n_conditions)))
+        conditions[0] += np.bincount(batch.condition, minlength=n_conditions)
+        for row, name in enumerate(('wait_time', 'treatment_duration', 'cost'), 1):
+            conditions[row] += np.bincount(batch.condition, weights=batch[name], minlength=n_conditions)
+
+    def condition_summary(self) -> pd.DataFrame:
+        rows = []
+        for scenario, (patients, wait_time, treatment_duration, cost) in self.conditions.items():
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rows.append(pd.DataFrame({
+                    'scenario': SCENARIO_LABELS.get(scenario, scenario),
+                    'condition': self.condition_names,
+                    'patients': patients.astype(np.int64),
+                    'avg_wait_time': wait_time / patients,
+                    'avg_treatment_time': treatment_duration / patients,
+                    'avg_cost_per_patient': cost / patients,
+                    'total_cost': cost,
+                }))
+        return pd.concat(rows, ignore_index=True)
+
+    def scenario_summary(self) -> pd.DataFrame:
+        rows = []
+        for scenario, (patients, wait_time, treatment_duration, cost) in self.conditions.items():
+            total = patients.sum()
+            rows.append({
+                'scenario': SCENARIO_LABELS.get(scenario, scenario),
+                'patients': int(total),
+                'avg_wait_time': wait_time.sum() / total,
+                'avg_treatment_time': treatment_duration.sum() / total,
+                'avg_cost_per_patient': cost.sum() / total,
+                'total_cost': cost.sum(),
+            })
+        return pd.DataFrame(rows)
+
+
+def _histogram_figure(aggregates: ReportAggregates, name: str):
+    figure = load('Figure')(figsize=(7, 3.5))
+    ax = figure.add_subplot()
+    edges = HISTOGRAM_EDGES[name]
+    for scenario, histograms in aggregates.histograms.items():
+        counts = histograms[name][1:-1]
+        share = counts / max(1, histograms[name].sum())
+        ax.stairs(share, edges, label=SCENARIO_LABELS.get(scenario, scenario))
+    ax.set_xscale('symlog' if edges[0] == 0 else 'log')
+    # Plain tick labels: mathtext parsing is not thread-safe
+    ax.xaxis.set_major_formatter(load('FuncFormatter')(lambda x, _: f'{x:,g}'))
+    ax.xaxis.set_minor_formatter(load('NullFormatter')())
+    ax.set_xlabel(HISTOGRAM_LABELS[name])
+    ax.set_ylabel('Share of patients')
+    ax.legend()
+    figure.tight_layout()
+    return figure
+
+
+def _time_of_day_figure(aggregates: ReportAggregates):
+    figure = load('Figure')(figsize=(7, 5))
+    arrivals_ax, wait_ax = figure.subplots(2, 1, sharex=True)
+    for scenario, (patients, wait_time) in aggregates.time_of_day.items():
+        hours = np.arange(len(patients)) * TIME_OF_DAY_MINUTES / 60
+        label = SCENARIO_LABELS.get(scenario, scenario)
+        arrivals_ax.step(hours, patients, where='post', label=label)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            wait_ax.step(hours, wait_time / patients, where='post', label=label)
+    arrivals_ax.set_ylabel(f'Arrivals per {TIME_OF_DAY_MINUTES} min')
+    wait_ax.set_ylabel('Average wait (minutes)')
+    wait_ax.set_xlabel('Hour of day')
+    wait_ax.set_xlim(0, 24)
+    arrivals_ax.legend()
+    figure.tight_layout()
+    return figure
+
+
+def _condition_figure(aggregates: ReportAggregates):
+    figure = load('Figure')(figsize=(7, 5))
+    wait_ax, cost_ax = figure.subplots(2, 1, sharex=True)
+    summary = aggregates.condition_summary()
+    positions = np.arange(len(aggregates.condition_names))
+    scenarios = summary['scenario'].unique()
+    width = 0.8 / len(scenarios)
+    for i, scenario in enumerate(scenarios):
+        rows = summary[summary['scenario'] == scenario]
+        wait_ax.bar(positions + i * width, rows['avg_wait_time'], width, label=scenario)
+        cost_ax.bar(positions + i * width, rows['avg_cost_per_patient'], width, label=scenario)
+    wait_ax.set_ylabel('Average wait (minutes)')
+    cost_ax.set_ylabel('Average cost (¥)')
+    cost_ax.set_xticks(positions + width * (len(scenarios) - 1) / 2, aggregates.condition_names, rotation=15)
+    wait_ax.legend()
+    figure.tight_layout()
+    return figure
+
+
+REPORT_FIGURES: Dict[str, Callable] = {
+    'Wait time distribution': lambda aggregates: _histogram_figure(aggregates, 'wait_time'),
+    'Treatment duration distribution': lambda aggregates: _histogram_figure(aggregates, 'treatment_duration'),
+    'Cost distribution': lambda aggregates: _histogram_figure(aggregates, 'cost'),
+    'Arrivals and waits by time of day': _time_of_day_figure,
+    'Outcomes by condition': _condition_figure,
+}
+
+
+def _render_png(build: Callable, aggregates: ReportAggregates, dpi: int) -> str:
+    """Build one figure with the object-oriented API and return it as base64 PNG."""
+    figure = build(aggregates)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', dpi=dpi)
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def build_report(simulation_results, path: str = 'simulation_report.html',
+                 title: str = 'Healthcare AI Simulation Report', workers: Optional[int] = 4,
+                 dpi: int = 100) -> Dict:
+    """Write a static HTML report with embedded PNG figures and summary tables.
+    
+    ``simulation_results`` is anything ``ReportAggregates.from_results`` takes.
+    Figures are drawn from fixed-size aggregates in a thread pool of
+    ``workers`` threads, so the report's size and build time are independent
+    of the number of simulated patients.
+    """
+    
+    start = time.perf_counter()
+    aggregates = (simulation_results if isinstance(simulation_results, ReportAggregates)
+                  else ReportAggregates.from_results(simulation_results))
+    aggregated = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        images = dict(zip(REPORT_FIGURES, executor.map(
+            lambda build: _render_png(build, aggregates, dpi), REPORT_FIGURES.values())))
+    
+    float_format = '{:,.1f}'.format
+    sections = [f"<h2>{html.escape(name)}</h2>\n"
+                f"<img alt=\"{html.escape(name)}\" src=\"data:image/png;base64,{image}\">"
+                for name, image in images.items()]
+    title = html.escape(title)
+    page = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 960px; margin: 2em auto; }}
+table {{ border-collapse: collapse; margin-bottom: 1em; }}
+th, td {{ padding: 0.25em 0.75em; text-align: right; border-bottom: 1px solid #ddd; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<h2>Summary</h2>
+{aggregates.scenario_summary().to_html(index=False, float_format=float_format)}
+<h2>By condition</h2>
+{aggregates.condition_summary().to_html(index=False, float_format=float_format)}
+{chr(10).join(sections)}
+</body>
+</html>
+"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    
+    finished = time.perf_counter()
+    return {
+        'path': path,
+        'bytes': len(page.encode('utf-8')),
+        'aggregation_seconds': aggregated - start,
+        'render_seconds': finished - aggregated,
+    }
@@ -0,0 +1,171 @@
+# ROI Sensitivity & Uncertainty Analysis
+# Tornado swings and Sobol variance attribution for the industry ROI model
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class ROISensitivityAnalysis:
+    """Sensitivity of 5-year ROI to the coefficients of ``AIAgentsROIAnalyzer``.
+    
+    Parameters are the industry coefficients read by the benefit formula, the
+    per-1000-employee implementation cost, the yearly benefit growth factor and
+    the yearly maintenance rate. Each is uniform on ``ranges[name]`` or, by
+    default, within ``±spread`` of its base value (of the growth *rate* for the
+    growth factor).
+    
+    Benefit formulas are linear in each coefficient, so the base case is compiled
+    once into per-coefficient benefit contributions; every sample, and every
+    one-column perturbation of a sample, then costs a handful of array operations.
+    """
+
+    def __init__(self, analyzer, industry: str, company_size: float, annual_revenue: float,
+                 years: int = 5, spread: float = 0.2,
+                 ranges: Optional[Dict[str, Tuple[float, float]]] = None):
+        if industry not in analyzer.industry_data:
+            raise ValueError(f"Industry {industry} not supported")
+        
+        self.analyzer = analyzer
+        self.industry = industry
+        self.company_size = company_size
+        self.annual_revenue = annual_revenue
+        self.years = years
+        
+        data = analyzer.industry_data[industry]
+        self.benefit_parameters = list(analyzer.registry.benefit_revenue_shares[industry])
+        
+        # Benefit contributed per unit of each coefficient, holding the others at zero
+        self._benefit_weights = np.array([
+            analyzer._annual_benefits(industry, annual_revenue,
+                                      data={key: float(key == name) for key in self.benefit_parameters})
+            for name in self.benefit_parameters
+        ])
+        
+        base = {name: data[name] for name in self.benefit_parameters}
+        base['implementation_cost'] = data['implementation_cost']
+        base['annual_benefit_growth'] = analyzer.annual_benefit_growth
+        base['annual_maintenance_rate'] = analyzer.annual_maintenance_rate
+        
+        ranges = dict(ranges or {})
+        for name, value in base.items():
+            if name in ranges:
+                continue
+            if name == 'annual_benefit_growth':
+                rate = value - 1
+                ranges[name] = (1 + rate * (1 - spread), 1 + rate * (1 + spread))
+            else:
+                ranges[name] = (value * (1 - spread), value * (1 + spread))
+        
+        self.parameter_names = list(base)
+        self.base = np.array([base[name] for name in self.parameter_names], dtype=float)
+        self.low = np.array([ranges[name][0] for name in self.parameter_names], dtype=float)
+        self.high = np.array([ranges[name][1] for name in self.parameter_names], dtype=float)
+        self._n_benefit = len(self.benefit_parameters)
+
+    @property
+    def parameters(self) -> pd.DataFrame:
+        return pd.DataFrame({'parameter': self.parameter_names, 'base': self.base,
+                             'low': self.low, 'high': self.high})
+
+    def sample(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Latin hypercube sample of ``n`` parameter vectors, shape ``(n, parameters)``."""
+        if rng is None:
+            rng = np.random.default_rng()
+        strata = np.argsort(rng.random((n, len(self.base))), axis=0)
+        unit = (strata + rng.random((n, len(self.base)))) / n
+        return self.low + unit * (self.high - self.low)
+
+    def _components(self, samples: np.ndarray) -> Dict[str, np.ndarray]:
+        """Intermediate model terms for each sample vector."""
+        k = self._n_benefit
+        return {
+            'benefits': samples[:, :k] @ self._benefit_weights,
+            'implementation_cost': (self.company_size / 1000) * samples[:, k],
+            'growth': samples[:, k + 1],
+            'maintenance': samples[:, k + 2],
+        }
+
+    def _roi(self, components: Dict[str, np.ndarray]) -> np.ndarray:
+        growth = components['growth']
+        implementation_cost = components['implementation_cost']
+        # Geometric series sum, which is just ``years`` without growth
+        factor = np.divide(growth ** self.years - 1, growth - 1, out=np.full(growth.shape, float(self.years)),
+                           where=growth != 1)
+        cumulative_benefits = components['benefits'] * factor
+        cumulative_costs = implementation_cost + implementation_cost * components['maintenance'] * self.years
+        return ((cumulative_benefits - cumulative_costs) / implementation_cost) * 100
+
+    def evaluate(self, samples: np.ndarray) -> np.ndarray:
+        """ROI percentage for each row of ``samples``."""
+        return self._roi(self._components(np.atleast_2d(samples)))
+
+    def _swap_column(self, components: Dict[str, np.ndarray], samples_a: np.ndarray,
+                     samples_b: np.ndarray, i: int) -> Dict[str, np.ndarray]:
+        """Components of ``samples_a`` with column ``i`` taken from ``samples_b``, reusing the rest."""
+        swapped = dict(components)
+        k = self._n_benefit
+        if i < k:
+            swapped['benefits'] = components['benefits'] + self._benefit_weights[i] * (samples_b[:, i] - samples_a[:, i])
+        elif i == k:
+            swapped['implementation_cost'] = (self.company_size / 1000) * samples_b[:, i]
+        elif i == k + 1:
+            swapped['growth'] = samples_b[:, i]
+        else:
+            swapped['maintenance'] = samples_b[:, i]
+        return swapped
+
+    def tornado(self) -> pd.DataFrame:
+        """One-at-a-time ROI swings between each parameter's low and high value."""
+        base_components = self._components(self.base[None, :])
+        base_roi = float(self._roi(base_components)[0])
+        rows = []
+        for i, name in enumerate(self.parameter_names):
+            roi_low = self._roi(self._swap_column(base_components, self.base[None, :], self.low[None, :], i))[0]
+            roi_high = self._roi(self._swap_column(base_components, self.base[None, :], self.high[None, :], i))[0]
+            rows.append({
+                'parameter': name,
+                'low': self.low[i],
+                'high': self.high[i],
+                'roi_low': roi_low,
+                'roi_high': roi_high,
+                'swing': abs(roi_high - roi_low),
+                'base_roi': base_roi
+            })
+        return pd.DataFrame(rows).sort_values('swing', ascending=False, ignore_index=True)
+
+    def sobol(self, n: int = 100_000, seed: Optional[int] = None) -> pd.DataFrame:
+        """First-order (Saltelli 2010) and total-order (Jansen) Sobol indices of ROI.
+        
+        Uses two independent Latin hypercube designs A and B of ``n`` samples and
+        one column swap per parameter, i.e. ``n * (parameters + 2)`` evaluations.
+        """
+        rng = np.random.default_rng(seed)
+        samples_a = self.sample(n, rng)
+        samples_b = self.sample(n, rng)
+        components_a = self._components(samples_a)
+        roi_a = self._roi(components_a)
+        roi_b = self.evaluate(samples_b)
+        variance = np.var(np.concatenate([roi_a, roi_b]))
+        
+        rows = []
+        for i, name in enumerate(self.parameter_names):
+            roi_ab = self._roi(self._swap_column(components_a, samples_a, samples_b, i))
+            rows.append({
+                'parameter': name,
+                'first_order': np.mean(roi_b * (roi_ab - roi_a)) / variance,
+                'total_order': np.mean((roi_a - roi_ab) ** 2) / (2 * variance)
+            })
+        return pd.DataFrame(rows).sort_values('total_order', ascending=False, ignore_index=True)
+
+    def uncertainty(self, n: int = 100_000, seed: Optional[int] = None) -> Dict:
+        """Distribution of ROI under the parameter ranges."""
+        roi = self.evaluate(self.sample(n, np.random.default_rng(seed)))
+        return {
+            'mean': roi.mean(),
+            'std': roi.std(ddof=1),
+            'p05': np.quantile(roi, 0.05),
+            'p50': np.quantile(roi, 0.5),
+            'p95': np.quantile(roi, 0.95),
+        }
@@ -0,0 +1,366 @@
+# Scenario Service
+# Asyncio HTTP/JSON endpoints for ROI and simulation with micro-batching and backpressure
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from analysis.ai_agents_roi_analyzer import AIAgentsROIAnalyzer
+from analysis.healthcare_simulation import HealthcareSimulator
+from analysis.queueing import QUEUE_MODELS
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+MAX_BODY_BYTES = 1_000_000
+MAX_ROI_YEARS = 100
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _jsonable(value):
+    """NumPy scalars and arrays as plain JSON values, with NaN as ``null``."""
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, (np.integer, np.bool_)):
+        return value.item()
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else float(value)
+    return value
+
+
+class ROIBatcher:
+    """Collects concurrent ROI requests for ``window`` seconds into one ``calculate_roi_batch`` call.
+    
+    A batch is flushed when the window closes or ``max_batch`` requests are
+    waiting, whichever comes first. If a batch fails, its requests are retried
+    one by one, so only the bad request gets the error.
+    """
+
+    def __init__(self, analyzer: AIAgentsROIAnalyzer, window: float = 0.002, max_batch: int = 4096):
+        self.analyzer = analyzer
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self._pending: List[Tuple[Tuple, asyncio.Future]] = []
+        self._flush_handle = None
+
+    def submit(self, industry: str, company_size: float, annual_revenue: float, years: int) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((industry, company_size, annual_revenue, years), future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            self._run(pending)
+
+    def _run(self, pending: List[Tuple[Tuple, asyncio.Future]]):
+        industries, company_sizes, annual_revenues, years = zip(*(params for params, _ in pending))
+        try:
+            results = self.analyzer.calculate_roi_batch(industries, company_sizes, annual_revenues, years)
+        except Exception as error:
+            if len(pending) > 1:
+                # Retry one by one, so a bad request fails alone
+                for item in pending:
+                    self._run([item])
+                return
+            _, future = pending[0]
+            if not future.done():
+                future.set_exception(error)
+            return
+        
+        self.batches += 1
+        self.requests += len(pending)
+        for i, (params, future) in enumerate(pending):
+            if future.done():
+                continue
+            horizon = params[3]
+            break_even_year = results['break_even_year'][i]
+            future.set_result({
+                'implementation_cost': results['implementation_cost'][i],
+                'annual_benefits': results['annual_benefits'][i],
+                'cumulative_benefits': results['cumulative_benefits'][i, :horizon],
+                'cumulative_costs': results['cumulative_costs'][i, :horizon],
+                'net_benefits': results['net_benefits'][i, :horizon],
+                'roi_percentage': results['roi_percentage'][i],
+                'payback_period_months': results['payback_period_months'][i],
+                'break_even_year': None if np.isnan(break_even_year) else int(break_even_year),
+            })
+
+
+def _int_param(params: Dict, name: str, default: Optional[int], low: int, high: int) -> Optional[int]:
+    """Integer request parameter within ``[low, high]``, or ``default`` when absent."""
+    value = params.get(name)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise HTTPError(400, f"{name} must be an integer")
+    try:
+        number = int(value)
+    except (ValueError, OverflowError):
+        raise HTTPError(400, f"{name} must be an integer")
+    if isinstance(value, float) and number != value:
+        raise HTTPError(400, f"{name} must be an integer")
+    if not low <= number <= high:
+        raise HTTPError(400, f"{name} must be between {low} and {high}")
+    return number
+
+
+def _run_simulation(simulator: HealthcareSimulator, params: Dict) -> Dict:
+    """Comparative simulation summary; runs in the simulation worker pool.
+    
+    Chunks are aggregated as they are produced, so memory stays bounded by one
+    block of days however long the simulated period is.
+    """
+    analysis = simulator.analyze_results(simulator.iter_comparative_simulation(**params))
+    return {'metrics': analysis['metrics'], 'improvements': analysis['improvements']}
+
+
+class ScenarioService:
+    """Local HTTP/JSON service over the ROI analyzer and hospital simulator.
+    
+    ``POST /roi`` takes ``industry``, ``company_size``, ``annual_revenue`` and
+    optional ``years``; concurrent requests are micro-batched by ``ROIBatcher``.
+    ``POST /simulate`` takes ``run_comparative_simulation`` parameters and runs
+    in a process pool; once ``max_queue_depth`` jobs are queued or running,
+    further jobs get ``503`` with ``Retry-After``. ``GET /health`` reports
+    batching and queue statistics.
+    """
+
+    def __init__(self, analyzer: Optional[AIAgentsROIAnalyzer] = None,
+                 simulator: Optional[HealthcareSimulator] = None, host: str = '127.0.0.1', port: int = 8080,
+                 batch_window: float = 0.002, max_batch: int = 4096, simulation_workers: Optional[int] = None,
+                 max_queue_depth: int = 8, max_simulation_days: int = 3650,
+                 max_patients_per_day: int = 100_000, max_servers: int = 10_000):
+        self.analyzer = analyzer or AIAgentsROIAnalyzer()
+        self.simulator = simulator or HealthcareSimulator()
+        self.host = host
+        self.port = port
+        self.batcher = ROIBatcher(self.analyzer, batch_window, max_batch)
+        self.simulation_workers = simulation_workers
+        self.max_queue_depth = max_queue_depth
+        self.max_simulation_days = max_simulation_days
+        self.max_patients_per_day = max_patients_per_day
+        self.max_servers = max_servers
+        self.queue_depth = 0
+        self.rejected = 0
+        self._server = None
+        self._executor = None
+
+    async def start(self):
+        # Spawned, not forked: forked workers would inherit the listening and client sockets
+        self._executor = ProcessPoolExecutor(max_workers=self.simulation_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as error:
+                    self._write_response(writer, error.status, {'error': str(error)}, error.headers, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, payload, extra_headers = 200, await self._dispatch(method, path, body), {}
+                except HTTPError as error:
+                    status, payload, extra_headers = error.status, {'error': str(error)}, error.headers
+                except Exception as error:
+                    status, payload, extra_headers = 500, {'error': str(error)}, {}
+                
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, extra_headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b''
+        return method, path.split('?', 1)[0], headers, body
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, payload, headers: Dict[str, str],
+                        keep_alive: bool):
+        body = json.dumps(_jsonable(payload)).encode()
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+                 'Content-Type: application/json',
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        routes = {
+            '/health': ('GET', self._health),
+            '/roi': ('POST', self._roi),
+            '/simulate': ('POST', self._simulate),
+        }
+        if path not in routes:
+            raise HTTPError(404, f"Unknown path {path}")
+        expected, handler = routes[path]
+        if method != expected:
+            raise HTTPError(405, f"{path} expects {expected}")
+        
+        params = {}
+        if body:
+            try:
+                params = json.loads(body)
+            except json.JSONDecodeError as error:
+                raise HTTPError(400, f"Invalid JSON: {error}")
+            if not isinstance(params, dict):
+                raise HTTPError(400, "Request body must be a JSON object")
+        return await handler(params)
+
+    async def _health(self, params: Dict) -> Dict:
+        return {
+            'status': 'ok',
+            'roi_requests': self.batcher.requests,
+            'roi_batches': self.batcher.batches,
+            'simulation_queue_depth': self.queue_depth,
+            'simulation_rejected': self.rejected,
+        }
+
+    async def _roi(self, params: Dict) -> Dict:
+        try:
+            industry = params['industry']
+            company_size = float(params['company_size'])
+            annual_revenue = float(params['annual_revenue'])
+        except (KeyError, TypeError, ValueError, OverflowError) as error:
+            raise HTTPError(400, f"Invalid ROI request: {error!r}")
+        if not isinstance(industry, str) or industry not in self.analyzer.industry_data:
+            raise HTTPError(400, f"Industry {industry} not supported")
+        if not (math.isfinite(company_size) and math.isfinite(annual_revenue)):
+            raise HTTPError(400, "company_size and annual_revenue must be finite")
+        if company_size <= 0:
+            raise HTTPError(400, "company_size must be positive")
+        years = _int_param(params, 'years', 5, 1, MAX_ROI_YEARS)
+        return await self.batcher.submit(industry, company_size, annual_revenue, years)
+
+    async def _simulate(self, params: Dict) -> Dict:
+        allowed = {'days', 'seed', 'num_patients', 'queue_model', 'servers', 'paired'}
+        unknown = set(params) - allowed
+        if unknown:
+            raise HTTPError(400, f"Unknown simulation parameters {sorted(unknown)}")
+        params = {
+            'days': _int_param(params, 'days', 30, 1, self.max_simulation_days),
+            'num_patients': _int_param(params, 'num_patients', 200, 1, self.max_patients_per_day),
+            'servers': _int_param(params, 'servers', 10, 1, self.max_servers),
+            'seed': _int_param(params, 'seed', None, 0, 2 ** 63 - 1),
+            'queue_model': params.get('queue_model', 'legacy'),
+            'paired': params.get('paired', False),
+        }
+        if params['queue_model'] not in QUEUE_MODELS:
+            raise HTTPError(400, f"queue_model must be one of {QUEUE_MODELS}")
+        if not isinstance(params['paired'], bool):
+            raise HTTPError(400, "paired must be true or false")
+        
+        if self.queue_depth >= self.max_queue_depth:
+            self.rejected += 1
+            raise HTTPError(503, "Simulation queue is full", {'Retry-After': '1'})
+        
+        self.queue_depth += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _run_simulation, self.simulator, params)
+        finally:
+            self.queue_depth -= 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ROI and simulation endpoints over HTTP/JSON")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--batch-window-ms', type=float, default=2.0)
+    parser.add_argument('--max-batch', type=int, default=4096)
+    parser.add_argument('--workers', type=int, default=None, help='simulation worker processes')
+    parser.add_argument('--max-queue-depth', type=int, default=8)
+    args = parser.parse_args()
+    
+    service = ScenarioService(host=args.host, port=args.port, batch_window=args.batch_window_ms / 1000,
+                              max_batch=args.max_batch, simulation_workers=args.workers,
+                              max_queue_depth=args.max_queue_depth)
+
+    async def run():
+        await service.start()
+        # SIGINT and SIGTERM stop the server and shut the worker pool down
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        print(f"Serving on http://{service.host}:{service.port}", flush=True)
+        try:
+            await stop.wait()
+        finally:
+            await service.close()
+    
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# Streaming Simulation Sinks
+# Incremental on-disk storage and running aggregates for chunked simulation output
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from analysis.patient_batch import PatientBatch
+
+SCENARIOS = ('traditional', 'ai_enabled')
+
+_METADATA_FILE = 'metadata.json'
+
+
+def batch_totals(batch: PatientBatch) -> np.ndarray:
+    """Patient count and wait, treatment and cost sums that ``RunningMetrics`` accumulates."""
+    return np.array([
+        len(batch),
+        batch.wait_time.sum(dtype=np.float64),
+        batch.treatment_duration.sum(dtype=np.float64),
+        batch.cost.sum(dtype=np.float64),
+    ])
+
+
+class RunningMetrics:
+    """Per-scenario sums and counts from which ``analyze_results`` metrics are derived."""
+
+    def __init__(self):
+        self._totals = {}
+
+    def update_totals(self, scenario: str, totals: np.ndarray):
+        """Fold in ``batch_totals``, or a sum of them."""
+        running = self._totals.setdefault(scenario, np.zeros(4))
+        running += totals
+
+    def update_batch(self, scenario: str, batch: PatientBatch):
+        self.update_totals(scenario, batch_totals(batch))
+
+    def update(self, chunk: Dict):
+        """Fold in a chunk from ``iter_comparative_simulation`` or ``read_stream``."""
+        for scenario in SCENARIOS:
+            if scenario in chunk:
+                self.update_batch(scenario, chunk[scenario])
+
+    def scenario_metrics(self, scenario: str) -> Dict:
+        patients, wait_time, treatment_duration, cost = self._totals[scenario]
+        return {
+            'avg_wait_time': wait_time / patients,
+            'avg_treatment_time': treatment_duration / patients,
+            'avg_total_time': (wait_time + treatment_duration) / patients,
+            'avg_cost_per_patient': cost / patients,
+            'total_cost': cost,
+            'total_patients': int(patients),
+        }
+
+    def metrics(self) -> Dict:
+        return {scenario: self.scenario_metrics(scenario) for scenario in SCENARIOS if scenario in self._totals}
+
+
+class _FileSink(ABC):
+    """Appends chunks to one file per scenario and keeps running metrics."""
+
+    format = None
+    extension = None
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.running_metrics = RunningMetrics()
+        self._metadata_written = False
+        os.makedirs(directory, exist_ok=True)
+        for scenario in SCENARIOS:
+            path = self.path(scenario)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def path(self, scenario: str) -> str:
+        return os.path.join(self.directory, f"{scenario}.{self.extension}")
+
+    def write(self, chunk: Dict):
+        for scenario in SCENARIOS:
+            if scenario not in chunk:
+                continue
+            batch = chunk[scenario]
+            if not self._metadata_written:
+                with open(os.path.join(self.directory, _METADATA_FILE), 'w') as f:
+                    json.dump({'format': self.format, 'condition_names': batch.condition_names,
+                               'severity_names': batch.severity_names}, f)
+                self._metadata_written = True
+            self._append(scenario, batch)
+            self.running_metrics.update_batch(scenario, batch)
+
+    def consume(self, stream: Iterable[Dict]) -> RunningMetrics:
+        """Write every chunk of ``stream`` and close the sink."""
+        with self:
+            for chunk in stream:
+                self.write(chunk)
+        return self.running_metrics
+
+    @abstractmethod
+    def _append(self, scenario: str, batch: PatientBatch):
+        """Write one scenario's batch to its file."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CSVSink(_FileSink):
+    """Streams chunks into ``traditional.csv`` and ``ai_enabled.csv``."""
+
+    format = 'csv'
+    extension = 'csv'
+
+    def _append(self, scenario: str, batch: PatientBatch):
+        path = self.path(scenario)
+        batch.to_frame().to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+
+class ParquetSink(_FileSink):
+    """Streams chunks into ``traditional.parquet`` and ``ai_enabled.parquet``, one row group each.
+    
+    Requires ``pyarrow``.
+    """
+
+    format = 'parquet'
+    extension = 'parquet'
+
+    def __init__(self, directory: str):
+        import pyarrow  # noqa: F401  fail early when the optional dependency is missing
+        super().__init__(directory)
+        self._writers = {}
+
+    def _append(self, scenario: str, batch: PatientBatch):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        table = pa.Table.from_pandas(batch.to_frame(), preserve_index=False)
+        if scenario not in self._writers:
+            self._writers[scenario] = pq.ParquetWriter(self.path(scenario), table.schema)
+        self._writers[scenario].write_table(table)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+
+def _frame_to_batch(frame: pd.DataFrame, condition_names, severity_names) -> PatientBatch:
+    return PatientBatch(
+        age=frame['age'].to_numpy(),
+        condition=pd.Categorical(frame['condition'], categories=condition_names).codes,
+        severity=pd.Categorical(frame['severity'], categories=severity_names).codes,
+        arrival_minute=frame['arrival_minute'].to_numpy(),
+        patient_index=frame['patient_index'].to_numpy(),
+        wait_time=frame['wait_time'].to_numpy(),
+        treatment_duration=frame['treatment_duration'].to_numpy(),
+        cost=frame['cost'].to_numpy(),
+        ai_assisted=frame['ai_assisted'].to_numpy(),
+        condition_names=condition_names,
+        severity_names=severity_names
+    )
+
+
+def read_stream(directory: str, chunk_rows: int = 1_000_000) -> Iterator[Dict]:
+    """Read a sink directory back as chunks of at most ``chunk_rows`` patients per scenario."""
+    
+    with open(os.path.join(directory, _METADATA_FILE)) as f:
+        metadata = json.load(f)
+    condition_names = metadata['condition_names']
+    severity_names = metadata['severity_names']
+    
+    for scenario in SCENARIOS:
+        path = os.path.join(directory, f"{scenario}.{metadata['format']}")
+        if not os.path.exists(path):
+            continue
+        if metadata['format'] == 'parquet':
+            import pyarrow.parquet as pq
+            frames = (record_batch.to_pandas()
+                      for record_batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows))
+        else:
+            frames = pd.read_csv(path, chunksize=chunk_rows)
+        for frame in frames:
+            yield {scenario: _frame_to_batch(frame, condition_names, severity_names)}
+
+
+def write_stream(stream: Iterable[Dict], directory: str, format: str = 'parquet') -> RunningMetrics:
+    """Write a chunk stream to ``directory`` with the sink for ``format`` ('parquet' or 'csv')."""
+    sinks = {'parquet': ParquetSink, 'csv': CSVSink}
+    if format not in sinks:
+        raise ValueError(f"Unknown format {format!r}, expected one of {tuple(sinks)}")
+    return sinks[format](directory).consume(stream)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Patient Generation Benchmark
+Compares the scalar generate_patient loop with the vectorized generate_patients batch
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from analysis.healthcare_simulation import HealthcareSimulator
+
+
+def run_benchmark(n: int = 100_000, scalar_n: int = 100_000, seed: int = 0):
+    simulator = HealthcareSimulator()
+    timestamp = datetime(2025, 1, 1, 8)
+    np.random.seed(seed)
+    
+    start = time.perf_counter()
+    for i in range(scalar_n):
+        simulator.generate_patient(f"P{i:06d}", timestamp, ai_enabled=True)
+    scalar_per_patient = (time.perf_counter() - start) / scalar_n
+    
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    simulator.generate_patients(n, timestamp, ai_enabled=True, rng=rng)
+    vector_per_patient = (time.perf_counter() - start) / n
+    
+    return {
+        'n': n,
+        'scalar_patients_per_sec': 1 / scalar_per_patient,
+        'vector_patients_per_sec': 1 / vector_per_patient,
+        'speedup': scalar_per_patient / vector_per_patient
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=100_000, help='patients per vectorized batch')
+    parser.add_argument('--scalar-n', type=int, default=100_000,
+                        help='patients for the scalar loop (per-patient cost is extrapolated)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    result = run_benchmark(args.n, args.scalar_n, args.seed)
+    print(f"Scalar generate_patient:     {result['scalar_patients_per_sec']:>14,.0f} patients/s")
+    print(f"Vectorized generate_patients: {result['vector_patients_per_sec']:>13,.0f} patients/s")
+    print(f"Speedup at n={result['n']:,}: {result['speedup']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark
+Measures cold import time of the analysis modules and checks that plotting stays lazy
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['analysis.ai_agents_roi_analyzer', 'analysis.healthcare_simulation']
+PLOTTING_PACKAGES = ['matplotlib', 'seaborn', 'plotly']
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = sorted({{name.split('.')[0] for name in sys.modules}} & set({packages!r}))
+print(json.dumps({{'seconds': elapsed, 'plotting_loaded': loaded}}))
+"""
+
+
+def measure(module: str, repeat: int = 5):
+    """Best-of-``repeat`` cold import time of ``module`` in fresh interpreters."""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, packages=PLOTTING_PACKAGES)],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output))
+    return {'seconds': min(run['seconds'] for run in runs), 'plotting_loaded': runs[0]['plotting_loaded']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--check', action='store_true',
+                        help='exit with status 1 if importing a module loads a plotting package')
+    args = parser.parse_args()
+    
+    failures = []
+    for module in MODULES:
+        result = measure(module, args.repeat)
+        print(f"{module:<40} {result['seconds'] * 1000:8.1f} ms  plotting loaded: "
+              f"{', '.join(result['plotting_loaded']) or 'none'}")
+        if result['plotting_loaded']:
+            failures.append(module)
+    
+    if args.check and failures:
+        print(f"Plotting imported eagerly by: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
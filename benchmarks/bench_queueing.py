@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Queueing Engine Benchmark
+Times the legacy heuristic and the multi-server FIFO/priority engines on one large day
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from analysis.queueing import legacy_wait_times, multi_server_wait_times
+
+
+def run_benchmark(arrivals: int = 1_000_000, servers: int = 12_000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    arrival_minutes = np.sort(rng.uniform(0, 600, arrivals))
+    durations = rng.uniform(15, 120, arrivals)
+    priorities = rng.integers(0, 4, arrivals)
+    base_wait = np.maximum(0, rng.normal(10, 5, arrivals))
+    
+    engines = {
+        'legacy': lambda: legacy_wait_times(arrival_minutes, durations, base_wait, capacity=servers),
+        'fifo': lambda: multi_server_wait_times(arrival_minutes, durations, servers),
+        'priority': lambda: multi_server_wait_times(arrival_minutes, durations, servers, priorities)
+    }
+    
+    results = {}
+    for name, engine in engines.items():
+        start = time.perf_counter()
+        waits = engine()
+        results[name] = {'seconds': time.perf_counter() - start, 'avg_wait': float(waits.mean())}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--arrivals', type=int, default=1_000_000)
+    parser.add_argument('--servers', type=int, default=12_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    for name, result in run_benchmark(args.arrivals, args.servers, args.seed).items():
+        print(f"{name:<9} {args.arrivals:,} arrivals in {result['seconds']:.2f}s "
+              f"(avg wait {result['avg_wait']:.1f} min)")
+
+
+if __name__ == "__main__":
+    main()
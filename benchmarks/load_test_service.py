@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Scenario Service Load Test
+Concurrent ROI and simulation traffic against a local instance of analysis/service.py
+
+Without --url a service is started in a subprocess on a free port and stopped
+afterwards; --batch-window-ms 0 there shows the throughput without batching.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import numpy as np
+
+INDUSTRIES = ['Healthcare', 'Finance', 'Logistics', 'Manufacturing']
+
+
+async def request(reader, writer, host, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def roi_client(host, port, requests, seed, latencies, statuses):
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            payload = {'industry': str(rng.choice(INDUSTRIES)),
+                       'company_size': float(rng.uniform(100, 20_000)),
+                       'annual_revenue': float(rng.uniform(1e6, 1e9)),
+                       'years': int(rng.integers(1, 11))}
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, host, 'POST', '/roi', payload)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def simulation_client(host, port, days, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        status, _ = await request(reader, writer, host, 'POST', '/simulate', {'days': days, 'seed': 0})
+        statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, connections, requests, simulations, simulation_days):
+    latencies, roi_statuses, simulation_statuses = [], {}, {}
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(roi_client(host, port, requests, seed, latencies, roi_statuses) for seed in range(connections)),
+        *(simulation_client(host, port, simulation_days, simulation_statuses) for _ in range(simulations))
+    )
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, health = await request(reader, writer, host, 'GET', '/health')
+    writer.close()
+
+    latencies = np.array(latencies) * 1000
+    return {
+        'roi_requests': len(latencies),
+        'elapsed_seconds': elapsed,
+        'roi_requests_per_second': len(latencies) / elapsed,
+        'roi_latency_ms_p50': float(np.percentile(latencies, 50)),
+        'roi_latency_ms_p99': float(np.percentile(latencies, 99)),
+        'roi_mean_batch_size': health['roi_requests'] / max(1, health['roi_batches']),
+        'roi_statuses': roi_statuses,
+        'simulation_statuses': simulation_statuses,
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_local_service(batch_window_ms, max_queue_depth):
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'analysis.service', '--port', str(port),
+         '--batch-window-ms', str(batch_window_ms), '--max-queue-depth', str(max_queue_depth)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True
+    )
+    process.stdout.readline()  # "Serving on ..."
+    return process, port
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='running service, e.g. http://127.0.0.1:8080')
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=200, help='ROI requests per connection')
+    parser.add_argument('--simulations', type=int, default=12, help='concurrent simulation jobs')
+    parser.add_argument('--simulation-days', type=int, default=5)
+    parser.add_argument('--batch-window-ms', type=float, default=2.0)
+    parser.add_argument('--max-queue-depth', type=int, default=4)
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        url = urlparse(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        process, port = start_local_service(args.batch_window_ms, args.max_queue_depth)
+        host = '127.0.0.1'
+
+    try:
+        results = asyncio.run(run_load(host, port, args.connections, args.requests,
+                                       args.simulations, args.simulation_days))
+    finally:
+        if process is not None:
+            # SIGINT lets the service close its worker pool before exiting
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
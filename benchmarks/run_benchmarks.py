@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Throughput, peak memory and scaling curves for the simulator and ROI hot paths
+
+Each case is also timed against a fixed calibration workload run right next
+to it; baselines are compared on that calibrated throughput, so a baseline
+recorded on one machine can be checked on another.
+
+Examples:
+    python benchmarks/run_benchmarks.py --profile quick --output results.json
+    python benchmarks/run_benchmarks.py --profile full --plot scaling.png
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from analysis.ai_agents_roi_analyzer import AIAgentsROIAnalyzer
+from analysis.arrivals import PoissonArrivals
+from analysis.healthcare_simulation import HealthcareSimulator
+from analysis.network import HospitalNetwork
+
+DAY = datetime(2025, 1, 1)
+
+
+def _generate_patient(size):
+    simulator = HealthcareSimulator()
+    return lambda: [simulator.generate_patient(f"P{i}", DAY) for i in range(size)]
+
+
+def _generate_patients(size):
+    simulator = HealthcareSimulator()
+    return lambda: simulator.generate_patients(size, DAY, rng=np.random.default_rng(0))
+
+
+def _simulate_hospital_day(size):
+    simulator = HealthcareSimulator()
+    return lambda: simulator.simulate_hospital_day(DAY, num_patients=size)
+
+
+def _simulate_day_arrays(size):
+    simulator = HealthcareSimulator()
+    servers = max(10, size // 15)
+    return lambda: simulator.simulate_day_arrays(DAY, num_patients=size, rng=np.random.default_rng(0),
+                                                 queue_model='fifo', servers=servers)
+
+
+def _poisson_arrivals(size):
+    arrivals = PoissonArrivals(HealthcareSimulator().arrival_process.segment_weights)
+    return lambda: arrivals.sample(DAY, size, np.random.default_rng(0))
+
+
+def _run_comparative_simulation(size):
+    simulator = HealthcareSimulator()
+    return lambda: simulator.run_comparative_simulation(size, seed=0, verbose=False)
+
+
+def _analyze_results(size):
+    simulator = HealthcareSimulator()
+    results = simulator.run_comparative_simulation(size, seed=0, verbose=False)
+    return lambda: simulator.analyze_results(results)
+
+
+def _network_simulation(size):
+    network = HospitalNetwork.synthetic(size, seed=0)
+    return lambda: network.run_simulation(30, seed=0, workers=os.cpu_count(), verbose=False)
+
+
+def _roi_scenarios(size):
+    rng = np.random.default_rng(0)
+    analyzer = AIAgentsROIAnalyzer()
+    industries = rng.choice(list(analyzer.industry_data), size)
+    sizes = rng.integers(50, 50_000, size)
+    revenues = rng.uniform(1e6, 1e10, size)
+    return analyzer, industries, sizes, revenues
+
+
+def _calculate_roi_by_industry(size):
+    analyzer, industries, sizes, revenues = _roi_scenarios(size)
+    scenarios = list(zip(industries.tolist(), sizes.tolist(), revenues.tolist()))
+    return lambda: [analyzer.calculate_roi_by_industry(*scenario) for scenario in scenarios]
+
+
+def _calculate_roi_batch(size):
+    analyzer, industries, sizes, revenues = _roi_scenarios(size)
+    return lambda: analyzer.calculate_roi_batch(industries, sizes, revenues)
+
+
+# name -> (setup, unit, quick sizes, full sizes)
+CASES = {
+    'generate_patient': (_generate_patient, 'patients', [200, 2_000], [200, 2_000, 20_000, 200_000]),
+    'generate_patients': (_generate_patients, 'patients', [200, 10_000, 100_000],
+                          [200, 10_000, 100_000, 1_000_000]),
+    'simulate_hospital_day': (_simulate_hospital_day, 'patients', [200, 2_000], [200, 2_000, 20_000, 200_000]),
+    'simulate_day_arrays': (_simulate_day_arrays, 'patients', [200, 10_000, 100_000],
+                            [200, 10_000, 100_000, 1_000_000]),
+    'poisson_arrivals': (_poisson_arrivals, 'arrivals', [200, 1_000_000], [200, 100_000, 1_000_000, 10_000_000]),
+    'run_comparative_simulation': (_run_comparative_simulation, 'days', [1, 30], [1, 30, 365]),
+    'analyze_results': (_analyze_results, 'days', [1, 30], [1, 30, 365]),
+    'network_simulation': (_network_simulation, 'facilities', [4], [4, 64, 512]),
+    'calculate_roi_by_industry': (_calculate_roi_by_industry, 'scenarios', [1, 1_000], [1, 1_000, 100_000]),
+    'calculate_roi_batch': (_calculate_roi_batch, 'scenarios', [1, 10_000, 1_000_000],
+                            [1, 10_000, 100_000, 1_000_000]),
+}
+
+
+# Shortest timed sample; faster runs are repeated until it is reached
+MIN_SAMPLE_SECONDS = 0.1
+
+
+def _calibration():
+    """Reference workload mixing interpreter-bound and NumPy-bound work."""
+    values = np.random.default_rng(0).random(100_000)
+    
+    def run():
+        total = 0
+        for i in range(20_000):
+            total += i * i
+        np.sort(values)
+        return total
+    return run
+
+
+def measure(setup, size, repeat=3):
+    """Best seconds per run and per calibration run, then peak traced memory of one run.
+    
+    Case and calibration samples alternate, so both see the same machine load.
+    """
+    run = setup(size)
+    calibration = _calibration()
+    run()
+    calibration()
+    seconds = calibration_seconds = float('inf')
+    for _ in range(repeat):
+        seconds = min(seconds, _timed(run))
+        calibration_seconds = min(calibration_seconds, _timed(calibration))
+    
+    tracemalloc.start()
+    run()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, calibration_seconds, peak_bytes
+
+
+def _timed(run):
+    """Mean seconds per call over at least ``MIN_SAMPLE_SECONDS``."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        run()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE_SECONDS:
+            return elapsed / calls
+
+
+def run_case(name, size, repeat=3, verbose=True):
+    setup, unit = CASES[name][:2]
+    seconds, calibration_seconds, peak_bytes = measure(setup, size, repeat)
+    result = {
+        'case': name,
+        'size': size,
+        'unit': unit,
+        'seconds': seconds,
+        'throughput': size / seconds,
+        'calibration_seconds': calibration_seconds,
+        'calibrated_throughput': size * calibration_seconds / seconds,
+        'peak_memory_mb': peak_bytes / 2 ** 20,
+    }
+    if verbose:
+        print(f"{name:<28} {size:>10,} {unit:<9} {seconds * 1000:>10.2f} ms "
+              f"{result['throughput']:>14,.0f} {unit}/s {result['peak_memory_mb']:>9.1f} MB")
+    return result
+
+
+def run_suite(profile='quick', cases=None, repeat=3, verbose=True):
+    results = []
+    for name, (_, _, quick_sizes, full_sizes) in CASES.items():
+        if cases and name not in cases:
+            continue
+        for size in quick_sizes if profile == 'quick' else full_sizes:
+            results.append(run_case(name, size, repeat, verbose))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Cases whose calibrated throughput fell more than ``tolerance`` below the baseline.
+    
+    Calibrated throughput is work done per calibration run, which cancels most
+    of the difference between machines and between quiet and busy hosts.
+    """
+    reference = {(r['case'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        previous = reference.get((result['case'], result['size']))
+        if previous is None or 'calibrated_throughput' not in previous:
+            continue
+        ratio = result['calibrated_throughput'] / previous['calibrated_throughput']
+        if ratio < 1 - tolerance:
+            regressions.append({**result, 'baseline_calibrated_throughput': previous['calibrated_throughput'],
+                                'ratio': ratio})
+    return regressions
+
+
+def plot_scaling(results, path):
+    """Log-log throughput curves, one line per case."""
+    from analysis.plotting import load
+    
+    plt = load('plt')
+    fig, ax = plt.subplots(figsize=(9, 6))
+    for name in dict.fromkeys(r['case'] for r in results):
+        rows = [r for r in results if r['case'] == name]
+        ax.plot([r['size'] for r in rows], [r['throughput'] for r in rows], marker='o',
+                label=f"{name} ({rows[0]['unit']}/s)")
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('Problem size')
+    ax.set_ylabel('Throughput')
+    ax.legend(fontsize=8)
+    ax.grid(True, which='both', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profile', choices=['quick', 'full'], default='quick')
+    parser.add_argument('--case', action='append', dest='cases', choices=list(CASES),
+                        help='run only this case (repeatable)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write results JSON here (usable as a baseline)')
+    parser.add_argument('--plot', help='write scaling curves to this image file')
+    parser.add_argument('--baseline', help='baseline JSON to compare calibrated throughput against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative drop in calibrated throughput before a case is flagged')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='times to re-measure flagged cases before reporting them')
+    args = parser.parse_args()
+    
+    results = run_suite(args.profile, args.cases, args.repeat)
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'profile': args.profile,
+        'results': results,
+    }
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.plot:
+        plot_scaling(results, args.plot)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for _ in range(args.retries):
+            if not regressions:
+                break
+            # Re-measure flagged cases and keep their best run, so a burst of
+            # load on a shared host does not fail the check on its own
+            print(f"Re-measuring {len(regressions)} flagged case(s)")
+            positions = {(x['case'], x['size']): i for i, x in enumerate(results)}
+            for r in regressions:
+                index = positions[r['case'], r['size']]
+                retry = run_case(r['case'], r['size'], args.repeat)
+                if retry['calibrated_throughput'] > results[index]['calibrated_throughput']:
+                    results[index] = retry
+            regressions = compare(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f"SLOWER: {r['case']} at {r['size']:,} {r['unit']}: {r['calibrated_throughput']:,.1f} vs "
+                  f"{r['baseline_calibrated_throughput']:,.1f} {r['unit']} per calibration run "
+                  f"({r['ratio']:.0%} of baseline)")
+        if regressions:
+            sys.exit(1)
+        print(f"No slowdowns beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
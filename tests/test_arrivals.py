@@ -0,0 +1,37 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from analysis.arrivals import PiecewiseConstantArrivals, PoissonArrivals
+
+WEIGHTS = [1, 3, 5, 2, 0, 4, 1]
+
+
+@pytest.mark.parametrize('resolution', [None, 1.0, 15.0])
+def test_arrivals_are_sorted_within_opening_hours(resolution):
+    rng = np.random.default_rng(0)
+    for process in (PiecewiseConstantArrivals(WEIGHTS, resolution=resolution),
+                    PoissonArrivals(WEIGHTS, resolution=resolution)):
+        minutes = process.sample(datetime(2025, 3, 3), 5000, rng)
+        
+        assert np.all(np.diff(minutes) >= 0)
+        assert minutes.min() >= 0 and minutes.max() < process.open_minutes
+        # No arrivals in the zero-weight segment
+        assert not np.any((minutes >= 240) & (minutes < 300))
+
+
+def test_poisson_mean_follows_rate_factor():
+    monday = datetime(2025, 3, 3)
+    process = PoissonArrivals(WEIGHTS, day_of_week_factors=(1.5, 1, 1, 1, 1, 0.5, 0.5),
+                              monthly_factors=(1,) * 2 + (1.2,) + (1,) * 9, surge_days={date(2025, 3, 3): 1.25})
+    assert process.rate_factor(monday) == pytest.approx(1.5 * 1.2 * 1.25)
+    
+    rng = np.random.default_rng(1)
+    volume = 200
+    counts = np.array([len(process.sample(monday, volume, rng)) for _ in range(2000)])
+    expected = process.expected_arrivals(monday, volume)
+    
+    # Poisson: the variance equals the mean, so the sample mean is within 4 standard errors
+    assert abs(counts.mean() - expected) < 4 * np.sqrt(expected / len(counts))
+    assert counts.var() == pytest.approx(expected, rel=0.1)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from analysis.ai_agents_roi_analyzer import AIAgentsROIAnalyzer
+from analysis.cache import ResultCache
+from analysis.healthcare_simulation import HealthcareSimulator
+
+
+def test_key_is_stable():
+    params = {'days': 5, 'seed': np.int64(3), 'paired': True}
+    coefficients = {'weights': np.array([0.5, 1.5]), 'costs': {'b': 2.0, 'a': 1}}
+    key = ResultCache.key('run', params, coefficients)
+    
+    assert key == ResultCache.key('run', dict(reversed(params.items())),
+                                  {'costs': {'a': 1, 'b': 2.0}, 'weights': [0.5, 1.5]})
+    assert key != ResultCache.key('run', {**params, 'seed': 4}, coefficients)
+    assert key != ResultCache.key('run', params, {**coefficients, 'weights': np.array([0.5, 1.25])})
+    assert key != ResultCache.key('other', params, coefficients)
+
+
+def test_coefficient_edit_misses():
+    analyzer = AIAgentsROIAnalyzer()
+    cache = ResultCache()
+    before = analyzer.calculate_roi_by_industry('Healthcare', 2500, 1e8, cache=cache)
+    analyzer.industry_data['Healthcare']['error_reduction'] += 5
+    
+    after = analyzer.calculate_roi_by_industry('Healthcare', 2500, 1e8, cache=cache)
+    assert cache.misses == 2
+    assert after['roi_percentage'] != before['roi_percentage']
+    assert after == analyzer.calculate_roi_by_industry('Healthcare', 2500, 1e8)
+    assert analyzer.calculate_roi_by_industry('Healthcare', 2500, 1e8, cache=cache) == after
+    assert cache.stats['memory_hits'] == 1
+
+
+def test_disk_round_trip_is_memory_mapped(tmp_path):
+    simulator = HealthcareSimulator()
+    results = simulator.run_comparative_simulation(3, seed=7, verbose=False, cache=ResultCache(tmp_path))
+    
+    cache = ResultCache(tmp_path)
+    loaded = simulator.run_comparative_simulation(3, seed=7, verbose=False, cache=cache)
+    assert cache.stats['disk_hits'] == 1
+    assert loaded['simulation_period'] == results['simulation_period']
+    for scenario in ('traditional', 'ai_enabled'):
+        wait_time = loaded[scenario].wait_time
+        assert isinstance(wait_time.base, np.memmap)
+        assert not wait_time.flags.writeable
+        np.testing.assert_array_equal(wait_time, results[scenario].wait_time)
+        assert loaded[scenario].condition_names == results[scenario].condition_names
+    
+    with pytest.raises(ValueError):
+        loaded['traditional'].cost[0] = 0
+
+
+def test_memory_and_disk_eviction(tmp_path):
+    array_bytes = np.zeros(1000).nbytes
+    cache = ResultCache(tmp_path, max_memory_bytes=2 * array_bytes, max_disk_bytes=2 * array_bytes + 1000)
+    for i in range(3):
+        cache.put(f"k{i}", np.full(1000, i, dtype=float))
+    
+    assert cache.stats['memory_entries'] == 2
+    assert cache.stats['memory_bytes'] <= cache.max_memory_bytes
+    assert cache.stats['disk_bytes'] <= cache.max_disk_bytes
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['k1', 'k2']
+    
+    cache.get('k1')
+    cache.put('k3', np.full(1000, 3, dtype=float))
+    assert list(cache._memory) == ['k1', 'k3']
+    assert cache.get('k0') is None
+    
+    oversized = ResultCache(max_memory_bytes=array_bytes - 1)
+    oversized.put('big', np.zeros(1000))
+    assert oversized.stats['memory_entries'] == 0
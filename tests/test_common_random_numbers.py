@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import numpy as np
+
+from analysis.healthcare_simulation import HealthcareSimulator
+from analysis.replication import run_replications
+
+PATIENT_COLUMNS = ('age', 'condition', 'severity', 'arrival_minute', 'patient_index')
+
+
+def test_paired_scenarios_see_identical_patients():
+    results = HealthcareSimulator().run_comparative_simulation(3, seed=0, paired=True, verbose=False)
+    traditional, ai_enabled = results['traditional'], results['ai_enabled']
+    
+    assert len(traditional) == len(ai_enabled)
+    for column in PATIENT_COLUMNS:
+        np.testing.assert_array_equal(traditional[column], ai_enabled[column])
+    assert not traditional.ai_assisted.any()
+    assert ai_enabled.ai_assisted.all()
+
+
+def test_paired_day_differs_only_in_ai_effects():
+    simulator = HealthcareSimulator()
+    traditional, ai_enabled = simulator.simulate_paired_day_arrays(
+        datetime(2025, 1, 1), rng=np.random.default_rng(0), queue_model='fifo')
+    
+    for column in ('age', 'condition', 'severity', 'arrival_time', 'patient_index'):
+        np.testing.assert_array_equal(traditional[column], ai_enabled[column])
+    assert np.all(ai_enabled['treatment_duration'] <= traditional['treatment_duration'])
+
+
+def test_paired_savings_variance_well_below_independent():
+    simulator = HealthcareSimulator()
+    variances = {}
+    for paired in (False, True):
+        summary = run_replications(simulator, replications=30, days=5, seed=0, paired=paired)
+        variances[paired] = summary['metrics']['total_cost_savings']['std'] ** 2
+    
+    assert variances[True] * 10 < variances[False]
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from analysis.healthcare_simulation import HealthcareSimulator
+
+
+def reference_frame(simulator, results):
+    """Per-patient labels and metrics for a pandas groupby."""
+    frames = []
+    for scenario, key in (('Traditional', 'traditional'), ('AI-Enabled', 'ai_enabled')):
+        batch = results[key]
+        age_band = pd.cut(batch.age, [low - 1 for low, _ in simulator.age_weights] + [200],
+                          labels=[f"{low}-{high}" for low, high in simulator.age_weights])
+        frames.append(pd.DataFrame({
+            'scenario': scenario,
+            'condition': np.array(batch.condition_names)[batch.condition],
+            'severity': np.array(batch.severity_names)[batch.severity],
+            'age_band': age_band.astype(str),
+            'arrival_hour': [f"{hour:02d}:00" for hour in (batch.arrival_minute % 1440) // 60],
+            'wait_time': batch.wait_time.astype(float),
+            'treatment_duration': batch.treatment_duration.astype(float),
+            'cost': batch.cost.astype(float),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_matches_pandas_groupby():
+    simulator = HealthcareSimulator()
+    results = simulator.run_comparative_simulation(20, seed=4, queue_model='fifo', servers=8, verbose=False)
+    metrics = simulator.grouped_metrics(results, quantiles=(0.5, 0.9))
+    patients = reference_frame(simulator, results)
+    
+    for dimension in ('all', 'condition', 'severity', 'age_band', 'arrival_hour'):
+        keys = ['scenario'] if dimension == 'all' else ['scenario', dimension]
+        expected = patients.groupby(keys).agg(
+            patients=('wait_time', 'size'), avg_wait_time=('wait_time', 'mean'),
+            avg_treatment_time=('treatment_duration', 'mean'), avg_cost_per_patient=('cost', 'mean'),
+            wait_time_p90=('wait_time', lambda wait: wait.quantile(0.9)))
+        actual = metrics[metrics['dimension'] == dimension]
+        actual = actual.set_index(['scenario'] if dimension == 'all' else ['scenario', 'group'])
+        actual = actual.loc[expected.index]
+        
+        np.testing.assert_array_equal(actual['patients'], expected['patients'])
+        for column in ('avg_wait_time', 'avg_treatment_time', 'avg_cost_per_patient'):
+            np.testing.assert_allclose(actual[column], expected[column], rtol=1e-9)
+        large = expected['patients'] >= 100
+        np.testing.assert_allclose(actual['wait_time_p90'][large.to_numpy()], expected['wait_time_p90'][large],
+                                   rtol=0.01)
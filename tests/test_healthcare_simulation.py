@@ -0,0 +1,13 @@
+import pytest
+
+from analysis.healthcare_simulation import HealthcareSimulator
+
+
+@pytest.mark.parametrize('days', [0, -3])
+def test_rejects_fewer_than_one_day(days):
+    simulator = HealthcareSimulator()
+    
+    with pytest.raises(ValueError, match='days'):
+        simulator.run_comparative_simulation(days, seed=1, verbose=False)
+    with pytest.raises(ValueError, match='days'):
+        next(simulator.iter_comparative_simulation(days, seed=1))
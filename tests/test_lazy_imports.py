@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PLOTTING_PACKAGES = ('matplotlib', 'plotly', 'seaborn')
+
+_PROBE = """
+import json, sys
+import {module}
+print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}})))
+"""
+
+
+@pytest.mark.parametrize('module', ['analysis.ai_agents_roi_analyzer', 'analysis.healthcare_simulation'])
+def test_import_does_not_load_plotting(module):
+    output = subprocess.run([sys.executable, '-c', _PROBE.format(module=module)],
+                            cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+    loaded = set(json.loads(output))
+    
+    assert not loaded & set(PLOTTING_PACKAGES)
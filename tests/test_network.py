@@ -0,0 +1,28 @@
+import numpy as np
+
+from analysis.instrumentation import Instrumentation
+from analysis.network import HospitalNetwork
+
+
+def test_results_do_not_depend_on_workers_or_partitions():
+    network = HospitalNetwork.synthetic(5, seed=1, mean_volume=40)
+    serial = network.run_simulation(3, seed=2, workers=1, verbose=False)
+    parallel = network.run_simulation(3, seed=2, workers=2, partition_size=2, verbose=False)
+    
+    np.testing.assert_array_equal(serial['facilities'].to_numpy(), parallel['facilities'].to_numpy())
+    for scenario, metrics in serial['metrics'].items():
+        for name, value in metrics.items():
+            np.testing.assert_allclose(parallel['metrics'][scenario][name], value, rtol=1e-12)
+
+
+def test_hooks_time_network_runs():
+    events = []
+    hooks = Instrumentation(callbacks=[lambda event, payload: events.append((event, payload))])
+    network = HospitalNetwork.synthetic(4, seed=0, mean_volume=40)
+    network.run_simulation(2, seed=0, workers=2, partition_size=1, verbose=False, hooks=hooks)
+    
+    progress = [payload['completed_days'] for event, payload in events if event == 'progress']
+    assert events[0] == ('start', {'total_days': 4})
+    assert progress == [1, 2, 3, 4]
+    assert events[-1][0] == 'finish'
+    assert hooks.phase_calls['assemble'] == 4
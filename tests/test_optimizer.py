@@ -0,0 +1,26 @@
+import numpy as np
+
+from analysis.healthcare_simulation import HealthcareSimulator
+from analysis.optimizer import CapacityOptimizer
+
+
+def _optimizer():
+    return CapacityOptimizer(HealthcareSimulator(), num_patients=100, target_wait=20,
+                             min_replications=3, max_replications=8, seed=0)
+
+
+def test_more_servers_never_increase_wait_quantile():
+    optimizer = _optimizer()
+    for ai_fraction in (0.0, 1.0):
+        for replication in range(3):
+            waits = [optimizer.evaluate(servers, ai_fraction, replication)[0] for servers in range(4, 16)]
+            assert np.all(np.diff(waits) <= 1e-9)
+
+
+def test_optimum_is_feasible():
+    optimizer = _optimizer()
+    result = optimizer.optimize(ai_fractions=(0.0, 0.5, 1.0), max_servers=64)
+    
+    assert optimizer.is_feasible(result['servers'], result['ai_fraction'])
+    assert result['wait_quantile'] <= optimizer.target_wait
+    assert result['servers'] == optimizer.min_servers(result['ai_fraction'], max_servers=64)
@@ -0,0 +1,84 @@
+import heapq
+
+import numpy as np
+import pytest
+
+from analysis.queueing import legacy_wait_times, multi_server_wait_times
+
+
+def reference_wait_times(arrivals, durations, servers, priorities=None):
+    """Minute-by-minute multi-server queue: arrivals at ``t`` queue before dispatch at ``t``."""
+    n = len(arrivals)
+    priorities = [0] * n if priorities is None else list(priorities)
+    free_at = [float('-inf')] * servers
+    waits = np.zeros(n)
+    queue = []
+    next_arrival = 0
+    t = arrivals[0] if n else 0
+    while next_arrival < n or queue:
+        while next_arrival < n and arrivals[next_arrival] <= t:
+            queue.append(next_arrival)
+            next_arrival += 1
+        for server in range(servers):
+            if queue and free_at[server] <= t:
+                j = min(queue, key=lambda k: (priorities[k], k))
+                queue.remove(j)
+                waits[j] = t - arrivals[j]
+                free_at[server] = t + durations[j]
+        
+        upcoming = [arrivals[next_arrival]] if next_arrival < n else []
+        if queue:
+            upcoming += [free for free in free_at if free > t]
+        if upcoming:
+            t = min(upcoming)
+    return waits
+
+
+def original_legacy_wait_times(arrivals, durations, base_wait, capacity=10, overflow_minutes=15, wait_factor=1.0):
+    """The list-rebuilding loop ``simulate_hospital_day`` used before the heap version."""
+    waits = []
+    active_treatments = []
+    for arrival, duration, wait in zip(arrivals, durations, base_wait):
+        active_treatments = [t for t in active_treatments if t > arrival]
+        
+        if len(active_treatments) > capacity:
+            wait = (len(active_treatments) - capacity) * overflow_minutes
+        wait *= wait_factor
+        
+        waits.append(wait)
+        active_treatments.append(arrival + wait + duration)
+    return np.array(waits)
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('use_priorities', [False, True])
+def test_matches_reference_with_integer_ties(seed, use_priorities):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 80))
+    arrivals = np.sort(rng.integers(0, 60, n)).astype(float)
+    durations = rng.integers(1, 20, n).astype(float)
+    servers = int(rng.integers(1, 5))
+    priorities = rng.integers(0, 4, n).tolist() if use_priorities else None
+    
+    np.testing.assert_array_equal(multi_server_wait_times(arrivals, durations, servers, priorities),
+                                  reference_wait_times(arrivals.tolist(), durations.tolist(), servers, priorities))
+
+
+def test_arrival_at_release_minute_is_served_by_priority():
+    # The server frees at minute 10, when a critical patient arrives while a
+    # low-priority patient has been waiting since minute 1
+    waits = multi_server_wait_times(np.array([0.0, 1.0, 10.0]), np.array([10.0, 5.0, 5.0]), 1, [3, 3, 0])
+    
+    np.testing.assert_array_equal(waits, [0, 14, 0])
+
+
+@pytest.mark.parametrize('wait_factor', [1.0, 0.6])
+def test_legacy_heap_matches_original_list_rebuild(wait_factor):
+    rng = np.random.default_rng(0)
+    arrivals = np.sort(np.floor(rng.uniform(0, 600, 500)))
+    durations = rng.uniform(15, 120, 500)
+    base_wait = np.maximum(0, rng.normal(10, 5, 500))
+    
+    np.testing.assert_array_equal(legacy_wait_times(arrivals, durations, base_wait, wait_factor=wait_factor),
+                                  original_legacy_wait_times(arrivals, durations, base_wait,
+                                                             wait_factor=wait_factor))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from analysis.ai_agents_roi_analyzer import AIAgentsROIAnalyzer
+
+
+def test_batch_matches_scalar():
+    analyzer = AIAgentsROIAnalyzer()
+    industries = list(analyzer.industry_data)
+    results = analyzer.calculate_roi_batch(industries, 2500, 1e8, years=[1, 3, 5, 10])
+    
+    for i, (industry, years) in enumerate(zip(industries, [1, 3, 5, 10])):
+        scalar = analyzer.calculate_roi_by_industry(industry, 2500, 1e8, years)
+        assert results['roi_percentage'][i] == scalar['roi_percentage']
+        np.testing.assert_array_equal(results['net_benefits'][i, :years], scalar['net_benefits'])
+
+
+def test_batch_empty_input():
+    results = AIAgentsROIAnalyzer().calculate_roi_batch([], [], [])
+    
+    assert results['roi_percentage'].shape == (0,)
+    assert results['break_even_year'].shape == (0,)
+
+
+def test_batch_rejects_zero_years():
+    with pytest.raises(ValueError, match='years'):
+        AIAgentsROIAnalyzer().calculate_roi_batch(['Healthcare'], [100], [1e6], years=0)
+
+
+def test_coefficient_edits_reach_scalar_and_batch():
+    analyzer = AIAgentsROIAnalyzer()
+    before = analyzer.calculate_roi_batch(['Healthcare'], 2500, 1e8)['roi_percentage'][0]
+    analyzer.industry_data['Healthcare']['productivity_increase'] += 10
+    analyzer.industry_data['Healthcare']['implementation_cost'] *= 2
+    analyzer.industry_data['Healthcare']['payback_period'] = 24
+    
+    scalar = analyzer.calculate_roi_by_industry('Healthcare', 2500, 1e8)
+    batch = analyzer.calculate_roi_batch(['Healthcare'], 2500, 1e8)
+    assert scalar['roi_percentage'] != before
+    assert batch['roi_percentage'][0] == scalar['roi_percentage']
+    assert batch['implementation_cost'][0] == scalar['implementation_cost']
+    assert batch['payback_period_months'][0] == scalar['payback_period_months'] == 24
+
+
+def test_zero_benefit_growth():
+    analyzer = AIAgentsROIAnalyzer()
+    analyzer.annual_benefit_growth = 1
+    scalar = analyzer.calculate_roi_by_industry('Finance', 1000, 5e7, years=3)
+    
+    assert scalar['cumulative_benefits'] == [scalar['annual_benefits'] * year for year in (1, 2, 3)]
+    assert analyzer.calculate_roi_batch(['Finance'], 1000, 5e7, years=3)['roi_percentage'][0] == \
+        scalar['roi_percentage']
@@ -0,0 +1,16 @@
+import numpy as np
+
+from analysis.ai_agents_roi_analyzer import AIAgentsROIAnalyzer
+from analysis.sensitivity import ROISensitivityAnalysis
+
+
+def test_zero_benefit_growth():
+    analyzer = AIAgentsROIAnalyzer()
+    analyzer.annual_benefit_growth = 1
+    analysis = ROISensitivityAnalysis(analyzer, 'Healthcare', 2500, 1e8)
+    roi = analysis.evaluate(analysis.sample(64, np.random.default_rng(0)))
+    
+    assert np.isfinite(roi).all()
+    np.testing.assert_allclose(analysis.evaluate(analysis.base),
+                               analyzer.calculate_roi_by_industry('Healthcare', 2500, 1e8)['roi_percentage'],
+                               rtol=1e-12)
@@ -0,0 +1,30 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from analysis.healthcare_simulation import HealthcareSimulator
+from analysis.service import HTTPError, ScenarioService, _run_simulation
+
+
+@pytest.mark.parametrize('years', [5.7, True, '2.5', 0, 101])
+def test_roi_rejects_invalid_years(years):
+    service = ScenarioService()
+    params = {'industry': 'Healthcare', 'company_size': 2500, 'annual_revenue': 1e8, 'years': years}
+    
+    with pytest.raises(HTTPError) as error:
+        asyncio.run(service._roi(params))
+    assert error.value.status == 400
+
+
+def test_streamed_simulation_summary_matches_full_run():
+    simulator = HealthcareSimulator()
+    params = {'days': 4, 'num_patients': 50, 'servers': 5, 'seed': 3, 'queue_model': 'fifo', 'paired': True}
+    summary = _run_simulation(simulator, params)
+    
+    expected = simulator.summarize_results(simulator.run_comparative_simulation(verbose=False, **params))
+    assert summary.keys() == expected.keys()
+    for scenario, metrics in expected['metrics'].items():
+        assert summary['metrics'][scenario]['total_patients'] == metrics['total_patients']
+        for name, value in metrics.items():
+            np.testing.assert_allclose(summary['metrics'][scenario][name], value, rtol=1e-9)
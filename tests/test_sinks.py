@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from analysis.healthcare_simulation import HealthcareSimulator
+from analysis.patient_batch import PatientBatch
+from analysis.sinks import SCENARIOS, read_stream, write_stream
+
+COLUMNS = ('age', 'condition', 'severity', 'arrival_minute', 'patient_index',
+           'wait_time', 'treatment_duration', 'cost', 'ai_assisted')
+
+
+@pytest.mark.parametrize('format', ['csv', 'parquet'])
+def test_write_and_read_stream_round_trip(tmp_path, format):
+    if format == 'parquet':
+        pytest.importorskip('pyarrow')
+    simulator = HealthcareSimulator()
+    chunks = list(simulator.iter_comparative_simulation(6, seed=5, block_days=2))
+    
+    running_metrics = write_stream(iter(chunks), tmp_path, format=format)
+    read_back = {scenario: [] for scenario in SCENARIOS}
+    for chunk in read_stream(tmp_path, chunk_rows=500):
+        for scenario, batch in chunk.items():
+            assert len(batch) <= 500
+            read_back[scenario].append(batch)
+    
+    for scenario in SCENARIOS:
+        expected = PatientBatch.concat([chunk[scenario] for chunk in chunks])
+        actual = PatientBatch.concat(read_back[scenario])
+        assert actual.condition_names == expected.condition_names
+        assert actual.severity_names == expected.severity_names
+        for column in COLUMNS:
+            np.testing.assert_array_equal(getattr(actual, column), getattr(expected, column))
+    
+    reread_metrics = simulator.analyze_results(read_stream(tmp_path))['metrics']
+    for scenario, metrics in running_metrics.metrics().items():
+        assert reread_metrics[scenario] == pytest.approx(metrics, rel=1e-12)